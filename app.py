@@ -1,7 +1,17 @@
-from flask import Flask, request, Response, redirect, render_template, send_file, url_for
-from application.json_parser import parse_json_structures
+from flask import Flask, jsonify, request, Response, redirect, render_template, send_file, url_for
+from itertools import chain
+from application.api import handle_convert_request
+from application.archive import ArchiveOptions, iter_archive
+from application.artifact_store import ArtifactStore
+from application.cache import CachedResult, ResultCache
 from application.class_generator import ClassGenerator
+from application.config import Config
+from application.converter import EXTENSIONS, LANGUAGES, convert, convert_languages
+from application.emitter import compile_templates
+from application.executor import PoolSaturated, WorkerPool
+from application.json_parser import Budget
 from datetime import datetime
+from os import cpu_count
 from time import time
 
 
@@ -11,6 +21,30 @@ from time import time
 # Application factory.
 def create_app(test_config=None):  # noqa: C901
     app = Flask(__name__)
+    app.config.from_mapping(RESULT_CACHE_SIZE=256, ARTIFACT_STORE_DIR=None, ARTIFACT_STORE_MAX_BYTES=256 * 1024 * 1024,
+                            CONVERSION_WORKERS=cpu_count() or 1, CONVERSION_DEADLINE=10.0, CONVERSION_MAX_WAITING=32,
+                            PAYLOAD_MAX_BYTES=2 * 1024 * 1024, PAYLOAD_MAX_DEPTH=64, PAYLOAD_MAX_KEYS=100_000,
+                            PAYLOAD_MAX_ARRAY_LENGTH=100_000, PAYLOAD_MAX_MODELS=1000)
+    if test_config:
+        app.config.from_mapping(test_config)
+    # Requests are capped by the payload size: two JSON texts (or documents) and the other fields
+    max_bytes = app.config["PAYLOAD_MAX_BYTES"]
+    app.config.from_mapping(MAX_FORM_MEMORY_SIZE=max_bytes, MAX_CONTENT_LENGTH=max_bytes and 2 * max_bytes + 64 * 1024)
+    # Generated classes keep the order of the models
+    app.json.sort_keys = False
+
+    result_cache = ResultCache(app.config["RESULT_CACHE_SIZE"])
+    # Templates of the generated code for the default options (the others compile on first use)
+    compile_templates()
+    # Zip archives shared by all workers (disabled if no directory is configured)
+    artifact_store = ArtifactStore(app.config["ARTIFACT_STORE_DIR"], app.config["ARTIFACT_STORE_MAX_BYTES"]) \
+        if app.config["ARTIFACT_STORE_DIR"] else None
+    # Conversions run in worker processes with a deadline (inline if there are no workers)
+    conversion_pool = WorkerPool(app.config["CONVERSION_WORKERS"], app.config["CONVERSION_DEADLINE"],
+                                 app.config["CONVERSION_MAX_WAITING"])
+    # Limits of the inference work of a payload
+    budget = Budget(max_bytes, app.config["PAYLOAD_MAX_DEPTH"], app.config["PAYLOAD_MAX_KEYS"],
+                    app.config["PAYLOAD_MAX_ARRAY_LENGTH"], app.config["PAYLOAD_MAX_MODELS"])
 
     @app.route("/")
     def index():
@@ -21,9 +55,10 @@ def create_app(test_config=None):  # noqa: C901
         classes, error = {}, None
 
         if request.method == 'POST':
-            generator, classes, error = parse_classes('php')
+            result = parse_classes('php')
+            classes, error = result.classes, result.error
             if request.form.get("action") == 'download':
-                return prepare_zip_response(generator, classes, 'php')
+                return prepare_zip_response(result, 'php')
 
         return render_template("index.html", route="php", classes=classes, error=error)
 
@@ -32,9 +67,10 @@ def create_app(test_config=None):  # noqa: C901
         classes, error = {}, None
 
         if request.method == 'POST':
-            generator, classes, error = parse_classes('java')
+            result = parse_classes('java')
+            classes, error = result.classes, result.error
             if request.form.get("action") == 'download':
-                return prepare_zip_response(generator, classes, 'java')
+                return prepare_zip_response(result, 'java')
 
         return render_template("index.html", route="java", classes=classes, error=error)
 
@@ -43,28 +79,104 @@ def create_app(test_config=None):  # noqa: C901
         classes, error = {}, None
 
         if request.method == 'POST':
-            generator, classes, error = parse_classes('python')
+            result = parse_classes('python')
+            classes, error = result.classes, result.error
             if request.form.get("action") == 'download':
-                return prepare_zip_response(generator, classes, 'py')
+                return prepare_zip_response(result, 'py')
 
         return render_template("index.html", route="python", classes=classes, error=error)
 
+    @app.route("/all", methods=['POST'])
+    def all_languages():
+        # Models are inferred once for all the languages
+        result = parse_classes('all')
+        if request.form.get("action") == 'download':
+            return prepare_zip_response(result, 'all')
+
+        return jsonify(classes=result.classes, error=result.error)
+
+    @app.route("/api/v1/convert", methods=['POST'])
+    def api_convert():
+        # JSON in and out, no page rendering
+        body, status = handle_convert_request(request.get_json(silent=True), conversion_pool, budget)
+        return jsonify(body), status
+
+    @app.errorhandler(PoolSaturated)
+    def pool_saturated(e):
+        # The load is shed, so the client should retry later
+        message = f"Error: {e}"
+        response = jsonify(error=message) if request.is_json else Response(message, mimetype='text/plain')
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+
+    @app.route("/stats/cache")
+    def cache_stats():
+        return jsonify(result_cache.stats())
+
     @app.template_filter('current_year')
     def current_year_filter(_):
         return datetime.now().year
 
-    def parse_classes(language: str) -> tuple:
-        models, error = parse_json_structures(request.form["json_full"], request.form["json_min"])
-        generator = ClassGenerator(models)
-        classes = getattr(generator, f"generate_{language}_classes")()
-        return generator, classes, error
-
-    def prepare_zip_response(generator: ClassGenerator, classes: dict, language_extension: str) -> Response:
-        return send_file(
-            generator.create_zip_response(classes, language_extension),
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=f"{language_extension}_classes_{int(time())}.zip"
-        )
+    def parse_classes(language: str) -> CachedResult:
+        json_full, json_min = request.form["json_full"], request.form["json_min"]
+        config = Config.from_form(request.form)
+        key = ResultCache.make_key(json_full, json_min, config, language)
+
+        result = result_cache.get(key)
+        if result is None:
+            try:
+                if language == 'all':
+                    result = CachedResult(key, *conversion_pool.run(convert_languages, json_full, config, LANGUAGES,
+                                                                    json_min, budget))
+                else:
+                    result = CachedResult(key, *conversion_pool.run(convert, json_full, config, language, json_min,
+                                                                    budget))
+            except (TimeoutError, RuntimeError) as e:
+                # Not cached, the pool may just be busy
+                return CachedResult(key, {}, f"Error: {e}", transient=True)
+            result_cache.put(result)
+        return result
+
+    def prepare_zip_response(result: CachedResult, language_extension: str) -> Response:
+        if result.transient:
+            # No archive (nor its ETag) for a conversion that didn't complete, the client should retry later
+            response = Response(result.error, status=503, mimetype='text/plain')
+            response.headers["Retry-After"] = "1"
+            return response
+        try:
+            options = ArchiveOptions.from_form(request.form)
+        except ValueError as e:
+            return Response(f"Error: {e}", status=400, mimetype='text/plain')
+
+        # The same input always gives the same archive, so the content hash is its ETag
+        key = f"{result.key}-{options.key}"
+        if request.if_none_match.contains(key):
+            response = Response(status=304)
+            response.set_etag(key)
+            return response
+
+        download_name = f"{language_extension}_classes_{int(time())}.{options.extension}"
+        archive = artifact_store.open(key) if artifact_store else None
+        if archive is not None:
+            response = send_file(archive, mimetype=options.mimetype, as_attachment=True, download_name=download_name)
+        else:
+            if language_extension == 'all':
+                # A directory per language
+                files = chain.from_iterable(
+                    ClassGenerator.archive_files(classes, EXTENSIONS[language], language)
+                    for language, classes in result.classes.items()
+                )
+            else:
+                files = ClassGenerator.archive_files(result.classes, language_extension)
+            # Sent chunk by chunk as the files are archived (and stored for the next downloads)
+            chunks = iter_archive(files, options)
+            if artifact_store:
+                chunks = artifact_store.put_stream(key, chunks)
+            response = Response(chunks, mimetype=options.mimetype)
+            response.headers["Content-Disposition"] = f"attachment; filename={download_name}"
+
+        response.set_etag(key)
+        return response
 
     return app
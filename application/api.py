@@ -0,0 +1,91 @@
+import json
+from application.config import Config
+from application.converter import LANGUAGES, convert_document
+from application.executor import WorkerPool
+from application.json_parser import Budget
+
+
+def parse_convert_request(payload) -> tuple:
+    """
+    Validate the body of a conversion request:
+        json => JSON document (object or JSON text), or documents => list of {"json", "minimized_json"}
+        minimized_json => optional minimized document (with `json`), JSON text for a JSON text document
+            (JSON text of an object document is decoded)
+        languages => optional list of languages (all by default)
+        options => optional object of the configuration options (see `Config`)
+    Returns documents (list of (document, minimized document)), languages, configuration and whether it's a batch.
+    Errors are raised as ValueError.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object.")
+
+    batch = "documents" in payload
+    if batch:
+        if "json" in payload or not isinstance(payload["documents"], list):
+            raise ValueError("'documents' must be a list of documents (without 'json').")
+        items = payload["documents"]
+    elif "json" in payload:
+        items = [payload]
+    else:
+        raise ValueError("Request must have 'json' or 'documents'.")
+
+    documents = []
+    for item in items:
+        if not isinstance(item, dict) or "json" not in item:
+            raise ValueError("Every document must be an object with 'json'.")
+        documents.append(_parse_document(item["json"], item.get("minimized_json")))
+
+    languages = payload.get("languages", list(LANGUAGES))
+    if not isinstance(languages, list) or not languages or not all(language in LANGUAGES for language in languages):
+        raise ValueError(f"'languages' must be a non-empty list of {', '.join(LANGUAGES)}.")
+
+    return documents, languages, Config.from_dict(payload.get("options", {})), batch
+
+
+def _parse_document(document, minimized_document) -> tuple:
+    """Check the document and its minimized counterpart are of the same kind (objects, or JSON texts)."""
+    if not isinstance(document, (dict, str)):
+        raise ValueError("'json' must be an object or JSON text.")
+    if minimized_document is None or type(minimized_document) is type(document):
+        return document, minimized_document
+    if isinstance(document, dict) and isinstance(minimized_document, str):
+        try:
+            return document, json.loads(minimized_document)
+        except ValueError:
+            raise ValueError("'minimized_json' is not valid JSON text.") from None
+    raise ValueError("'minimized_json' must be of the same kind as 'json' (object or JSON text).")
+
+
+def convert_documents(documents: list, config: Config, languages: list, budget: Budget = None) -> list:
+    """
+    Convert the documents (see `parse_convert_request`), each one parsed once for all the languages
+    and limited by the budget on its own.
+    """
+    results = []
+    for document, minimized_document in documents:
+        classes, error = convert_document(document, config, languages, minimized_document, budget)
+        results.append({"classes": classes, "error": error})
+    return results
+
+
+def handle_convert_request(payload, pool: WorkerPool = None, budget: Budget = None) -> tuple:
+    """
+    Convert the documents of the request (see `parse_convert_request`) in the worker pool (inline without one).
+    Returns the response body and HTTP status: {"classes": {language: {name: code}}, "error": ...}
+    for a document, {"results": [...]} of them for a batch, {"error": ...} with status 400 for invalid requests
+    and 503 for conversions past the deadline. PoolSaturated is raised if the pool can't take the conversion.
+    """
+    try:
+        documents, languages, config, batch = parse_convert_request(payload)
+    except ValueError as e:
+        return {"error": f"Error: {e}"}, 400
+
+    try:
+        if pool is not None:
+            results = pool.run(convert_documents, documents, config, languages, budget)
+        else:
+            results = convert_documents(documents, config, languages, budget)
+    except (TimeoutError, RuntimeError) as e:
+        return {"error": f"Error: {e}"}, 503
+
+    return ({"results": results} if batch else results[0]), 200
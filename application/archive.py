@@ -0,0 +1,121 @@
+import tarfile
+import zipfile
+import zlib
+from io import BytesIO
+
+ARCHIVE_FORMATS = ("stored", "deflate", "tar.gz")
+DEFAULT_COMPRESSION_LEVEL = 6
+# Fixed file dates (the earliest a zip can have), so the same files always give the same archive bytes
+FILE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+FILE_MTIME = 315532800
+FILE_MODE = 0o644
+
+
+class ArchiveOptions:
+    """
+    Archive of the downloads: zip with stored (uncompressed) or deflated files, or tar.gz.
+    Compression level (0-9) applies to deflate and tar.gz.
+    """
+
+    def __init__(self, archive_format: str = "deflate", compression_level: int = DEFAULT_COMPRESSION_LEVEL):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{archive_format}'.")
+        if not 0 <= compression_level <= 9:
+            raise ValueError(f"Compression level must be from 0 to 9, got {compression_level}.")
+        self.archive_format = archive_format
+        self.compression_level = compression_level
+
+    @classmethod
+    def from_form(cls, form) -> "ArchiveOptions":
+        """Build archive options from the submitted form (`archive_format`, `compression_level`)."""
+        level = form.get("compression_level", "") or DEFAULT_COMPRESSION_LEVEL
+        try:
+            level = int(level)
+        except ValueError:
+            raise ValueError(f"Compression level must be from 0 to 9, got '{level}'.") from None
+        return cls(form.get("archive_format", "") or "deflate", level)
+
+    @property
+    def key(self) -> str:
+        """Part of the artifact key (archives of the same classes differ by their options)."""
+        return "stored" if self.archive_format == "stored" else f"{self.archive_format}-{self.compression_level}"
+
+    @property
+    def extension(self) -> str:
+        return "tar.gz" if self.archive_format == "tar.gz" else "zip"
+
+    @property
+    def mimetype(self) -> str:
+        return "application/gzip" if self.archive_format == "tar.gz" else "application/zip"
+
+
+class _ArchiveStream:
+    """
+    Write-only file object keeping the archive bytes until they are taken (gzip-compressed if the level is set).
+    It can't seek, so zip files are written with data descriptors after their content.
+    """
+
+    def __init__(self, gzip_level: int = None):
+        self.chunks = []
+        self.position = 0
+        # wbits 31: gzip header and trailer
+        self.compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31) if gzip_level is not None else None
+
+    def write(self, data) -> int:
+        size = len(data)
+        self.position += size
+        if self.compressor is not None:
+            data = self.compressor.compress(data)
+        if data:
+            self.chunks.append(bytes(data))
+        return size
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def take(self, final: bool = False) -> bytes:
+        """Bytes written since the last call (and the end of the compressed stream if it's the final one)."""
+        if final and self.compressor is not None:
+            self.chunks.append(self.compressor.flush())
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_archive(files, options: ArchiveOptions = None):
+    """
+    Yield the archive of `(path, text content)` files chunk by chunk: the bytes of a file are yielded
+    once it's written, so the archive is never held in memory as a whole.
+    Files have a fixed date, so archives of the same files are byte-identical.
+    """
+    options = options if options is not None else ArchiveOptions()
+
+    if options.archive_format == "tar.gz":
+        stream = _ArchiveStream(options.compression_level)
+        with tarfile.open(fileobj=stream, mode="w|") as tar:
+            for path, content in files:
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(path)
+                info.size = len(data)
+                info.mtime = FILE_MTIME
+                info.mode = FILE_MODE
+                tar.addfile(info, BytesIO(data))
+                chunk = stream.take()
+                if chunk:
+                    yield chunk
+        yield stream.take(final=True)
+        return
+
+    stream = _ArchiveStream()
+    compression = zipfile.ZIP_DEFLATED if options.archive_format == "deflate" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(stream, "w", compression, compresslevel=options.compression_level) as zf:
+        for path, content in files:
+            info = zipfile.ZipInfo(path, FILE_DATE_TIME)
+            info.external_attr = FILE_MODE << 16
+            zf.writestr(info, content, compression, options.compression_level)
+            yield stream.take()
+    # Central directory
+    yield stream.take()
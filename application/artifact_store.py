@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+TEMP_PREFIX = ".tmp-"
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of generated archives in a local directory, shared by all worker processes.
+    Least recently used files are removed once the total size exceeds the limit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def open(self, key: str):
+        """Open the stored artifact for reading (marking it as recently used) or return None."""
+        path = self._path(key)
+        try:
+            artifact = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return artifact
+
+    def put(self, key: str, data: bytes):
+        """Store the artifact atomically (workers storing the same key write the same content)."""
+        for _ in self.put_stream(key, [data]):
+            pass
+
+    def put_stream(self, key: str, chunks):
+        """
+        Yield the chunks of the artifact while writing them, and store it atomically once all of them are written.
+        Nothing is stored if the stream is abandoned (e.g. the client disconnects during the download).
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used artifacts until the total size fits the limit."""
+        artifacts, total_size = [], 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.startswith(TEMP_PREFIX):
+                    stat = entry.stat()
+                    artifacts.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+
+        for _, size, path in sorted(artifacts):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from application.config import Config
+
+
+class CachedResult:
+    """
+    Conversion result: generated classes and error message.
+    Transient results (the conversion didn't complete, e.g. it timed out) are not cached or archived.
+    """
+
+    def __init__(self, key: str, classes: dict, error, transient: bool = False):
+        self.key = key
+        self.classes = classes
+        self.error = error
+        self.transient = transient
+
+
+class ResultCache:
+    """
+    Bounded in-process LRU cache of conversion results, keyed by hash of the input and options.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(json_full: str, json_min: str, config: Config, language: str) -> str:
+        """Content hash of everything the result depends on."""
+        digest = hashlib.sha256()
+        for part in (json_full, json_min, json.dumps(vars(config), sort_keys=True), language):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Return cached result (marking it as recently used) or None."""
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, result: CachedResult):
+        """Store result, evicting the least recently used ones above the limit."""
+        with self.lock:
+            self.entries[result.key] = result
+            self.entries.move_to_end(result.key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.entries), "max_entries": self.max_entries, "hits": self.hits,
+                    "misses": self.misses}
@@ -1,5 +1,18 @@
+from io import BytesIO
+from application.archive import ArchiveOptions, iter_archive
 from application.config import Config
-from application.functions import to_camel_case, to_pascal_case, to_snake_case
+from application.emitter import render
+from application.functions import convert_keys
+from application.type_expr import ARRAY, MODEL, TypeExpr, property_type
+
+# Boxed Java types (generics and nullable values) and Jackson streaming reads of the scalar types
+JAVA_BOXED_TYPES = {"int": "Integer", "float": "Double", "bool": "Boolean", "string": "String"}
+JAVA_READ_VALUES = {
+    "int": "parser.getIntValue()",
+    "float": "parser.getDoubleValue()",
+    "bool": "parser.getBooleanValue()",
+    "string": "parser.getText()",
+}
 
 
 class ClassGenerator:
@@ -7,248 +20,198 @@ class ClassGenerator:
     Generate classes code for appropriate language.
     """
 
-    def __init__(self, json_models):
+    def __init__(self, json_models, config: Config = None):
         self.models = json_models
-        self.config = Config()
+        self.config = config if config is not None else Config()
 
     def generate_php_classes(self) -> dict:
-        """Generate PHP classes."""
+        """Generate PHP classes (and their hydrators with the opcache preload script if enabled)."""
         php_classes = {}
         for model_name, properties in self.models.items():
             php_classes[model_name] = self._generate_php_class(model_name, properties)
+        if self.config.php_hydrators:
+            for model_name, properties in self.models.items():
+                php_classes[f"{model_name}Hydrator"] = self._generate_php_hydrator(model_name, properties)
+            php_classes["preload"] = self._generate_php_preload(list(php_classes))
         return php_classes
 
     def generate_java_classes(self) -> dict:
-        """Generate Java classes."""
+        """Generate Java classes (and their streaming deserializers if enabled)."""
         java_classes = {}
         for model_name, properties in self.models.items():
             java_classes[model_name] = self._generate_java_class(model_name, properties)
+        if self.config.java_streaming_deserializers:
+            for model_name, properties in self.models.items():
+                java_classes[f"{model_name}Deserializer"] = self._generate_java_deserializer(model_name, properties)
         return java_classes
 
     def generate_python_classes(self) -> dict:
         """Generate Python classes."""
-        python_classes = ["from typing import List\nfrom typing import Any\nfrom dataclasses import dataclass"]
+        if self.config.python_fast_path:
+            python_classes = ["from __future__ import annotations\n\n"
+                              "from dataclasses import dataclass\nfrom typing import Any, List, Optional"]
+            generate_class = self._generate_python_fast_class
+        else:
+            python_classes = ["from typing import List\nfrom typing import Any\nfrom dataclasses import dataclass"]
+            generate_class = self._generate_python_class
         for model_name in list(self.models.keys())[::-1]:
-            python_classes.append(self._generate_python_class(model_name, self.models[model_name]))
+            python_classes.append(generate_class(model_name, self.models[model_name]))
         return {"dataclass": "\n\n\n".join(python_classes)}
 
+    @staticmethod
+    def archive_files(class_dict, language_extension, directory: str = ""):
+        """Files of the generated classes to archive: `(path, content)` (in the directory if it's set)."""
+        prefix = f"{directory}/" if directory else ""
+        return ((f"{prefix}{class_name}.{language_extension}", content) for class_name, content in class_dict.items())
+
     @staticmethod
     def create_zip_response(class_dict, language_extension):
         """Save generated classes to a zip archive in-memory and return as response."""
-        import zipfile
-        from io import BytesIO
-
-        zip_buffer = BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, 'w') as zf:
-            for class_name, class_content in class_dict.items():
-                filename = f"{class_name}.{language_extension}"
-                zf.writestr(filename, class_content)
-
-        # Reset buffer
-        zip_buffer.seek(0)
-
-        return zip_buffer
+        files = ClassGenerator.archive_files(class_dict, language_extension)
+        return BytesIO(b"".join(iter_archive(files, ArchiveOptions("stored"))))
 
     def _generate_php_class(self, class_name: str, properties: dict):
         """Generate a PHP class."""
-        class_lines = [
-            "<?php declare(strict_types=1);",
-            "",
-            f"namespace App\\Model;",
-            ""
-        ]
-
-        if self.config.php_jms_annotation:
-            class_lines.append(f"use JMS\\Serializer\\Annotation as Serializer;")
-            class_lines.append("")
-
-        class_lines.append(f"final class {class_name}")
-        class_lines.append(f"{{")
-
-        for prop, (prop_type, nullable, prop_types) in properties.items():
-            php_prop = to_camel_case(prop)
-            php_type = self._map_to_php_type(prop_type) if prop_type != 'mixed' else self._map_to_php_type(prop_types)
-
-            if self.config.php_old_version:
-                nullable_prefix = 'null|' if nullable else ''
-                class_lines.append(f"    /**")
-                class_lines.append(f"     * @var {nullable_prefix}{prop_type}")
-                if self.config.php_jms_annotation:
-                    class_lines.append(f"     *")
-                    if "array" in prop_type:
-                        class_lines.append(f"     * @Serializer\\Type(\"{prop_type}\")")
-                    else:
-                        class_lines.append(f"     * @Serializer\\Type(\"{php_type}\")")
-                    class_lines.append(f"     * @Serializer\\SerializedName(\"{prop}\")")
-                class_lines.append(f"     */")
-                class_lines.append(f"    public ${php_prop};")
-                class_lines.append("")
-            else:
-                nullable_prefix = '?' if nullable else ''
-                if "array" in prop_type:
-                    php_type = "array"
-                    class_lines.append(f"    /** @var {prop_type} */")
-                    if self.config.php_jms_annotation:
-                        class_lines.append(f"    #[Serializer\\Type(\"{prop_type}\")]")
-                if "mixed" in prop_type and self.config.php_jms_annotation:
-                    class_lines.append(f"    #[Serializer\\Type(\"{php_type}\")]")
-                if self.config.php_jms_annotation:
-                    class_lines.append(f"    #[Serializer\\SerializedName(\"{prop}\")]")
-                class_lines.append(f"    public {nullable_prefix}{php_type} ${php_prop};")
-                if self.config.php_jms_annotation:
-                    class_lines.append("")
-
-        class_lines.append("}")
-
-        return "\n".join(class_lines)
+        return render("php/class", self.config, class_name=class_name,
+                      properties=self._template_properties(properties, "camel"))
+
+    def _generate_php_hydrator(self, class_name: str, properties: dict):
+        """Generate a PHP hydrator of the class assigning the array values directly (no reflection or metadata)."""
+        hydrated_properties = []
+        for key, name, _, type_expr, nullable in self._template_properties(properties, "camel"):
+            value = f"$data['{key}']"
+            hydrated = self._php_hydrate_expr(type_expr, value)
+            # Missing keys of the nullable properties are null too
+            if nullable and type_expr.kind == MODEL:
+                hydrated = f"{type_expr.value}Hydrator::hydrateNullable({value} ?? null)"
+            elif nullable:
+                hydrated = f"{value} ?? null" if hydrated == value else f"isset({value}) ? {hydrated} : null"
+            hydrated_properties.append((name, hydrated))
+
+        return render("php/hydrator", self.config, class_name=class_name, properties=hydrated_properties)
+
+    def _php_hydrate_expr(self, type_expr: TypeExpr, value: str, depth: int = 0) -> str:
+        """PHP expression hydrating the (non-null) value of the type: models go through their hydrators."""
+        if type_expr.kind == MODEL:
+            return f"{type_expr.value}Hydrator::hydrate({value})"
+        if type_expr.kind != ARRAY:
+            return value
+
+        if type_expr.value.kind == MODEL:
+            return f"array_map([{type_expr.value.value}Hydrator::class, 'hydrateNullable'], {value})"
+        item = f"$item{depth}"
+        hydrated_item = self._php_hydrate_expr(type_expr.value, item, depth + 1)
+        if hydrated_item == item:
+            # Arrays of scalars are assigned as they are
+            return value
+        # Closures rather than arrow functions, so the old PHP versions can run them too
+        return f"array_map(static function ({item}) {{ return {item} === null ? null : {hydrated_item}; }}, {value})"
+
+    def _generate_php_preload(self, class_names: list):
+        """Generate the opcache preload script compiling all the generated files."""
+        return render("php/preload", self.config, class_names=class_names)
 
     def _generate_java_class(self, class_name: str, properties: dict):
         """Generate a Java class."""
-        class_lines = [f"public class {class_name} {{"]
-
-        if self.config.java_use_properties:
-            for prop, (prop_type, nullable, prop_types) in properties.items():
-                java_prop = to_camel_case(prop)
-                java_type = self._map_to_java_type(prop_type) if prop_type != 'mixed' \
-                    else self._map_to_java_type(prop_types)
-                class_lines.append(f"    @JsonProperty(\"{prop}\")")
-                class_lines.append(f"    public {java_type} get{to_pascal_case(prop)}() {{")
-                class_lines.append(f"        return this.{java_prop};")
-                class_lines.append("    }}")
-                class_lines.append(f"    public void set{to_pascal_case(prop)}({java_type} {java_prop}) {{")
-                class_lines.append(f"        this.{java_prop} = {java_prop};")
-                class_lines.append("    }}")
-                class_lines.append(f"    {java_type} {java_prop};")
-                class_lines.append("")
-        else:
-            for prop, (prop_type, nullable, prop_types) in properties.items():
-                java_prop = to_camel_case(prop)
-                java_type = self._map_to_java_type(prop_type) if prop_type != 'mixed' \
-                    else self._map_to_java_type(prop_types)
-                class_lines.append(f"    @JsonProperty(\"{prop}\")")
-                class_lines.append(f"    public {java_type} {java_prop};")
+        java_accessors = convert_keys(properties, "pascal") if self.config.java_use_properties else {}
+        java_properties = [
+            (key, name, type_expr, java_accessors.get(key))
+            for key, name, _, type_expr, _ in self._template_properties(properties, "camel")
+        ]
 
-        class_lines.append("}")
+        return render("java/class", self.config, class_name=class_name, properties=java_properties)
+
+    def _generate_java_deserializer(self, class_name: str, properties: dict):
+        """
+        Generate a Jackson deserializer of the Java class driven by the streaming parser tokens
+        (no reflection, unknown keys are skipped and null values keep the field defaults).
+        """
+        java_accessors = convert_keys(properties, "pascal")
+        read_properties = []
+        for key, name, _, type_expr, _ in self._template_properties(properties, "camel"):
+            if self.config.java_use_properties:
+                store = f"value.set{java_accessors[key]}(%s);"
+            else:
+                store = f"value.{name} = %s;"
+            read_properties.append((key, self._java_read_lines(type_expr, store)))
+
+        return render("java/deserializer", self.config, class_name=class_name, properties=read_properties)
+
+    def _java_read_lines(self, type_expr: TypeExpr, store: str, indent: str = "", depth: int = 0) -> list:
+        """Java statements reading the current value of the type and passing it to the `store` statement."""
+        if type_expr.is_base:
+            return [indent + store % JAVA_READ_VALUES[type_expr.value]]
+        if type_expr.kind == MODEL:
+            return [indent + store % f"{type_expr.value}Deserializer.read(parser, context)"]
+        if type_expr.kind != ARRAY:
+            # Mixed values are read as they are (maps, lists, strings, numbers or booleans)
+            return [indent + store % "parser.readValueAs(Object.class)"]
+
+        items = f"items{depth}"
+        return [
+            f"{indent}{self._java_boxed_type(type_expr)} {items} = new ArrayList<>();",
+            f"{indent}while (parser.nextToken() != JsonToken.END_ARRAY) {{",
+            f"{indent}    if (parser.currentToken() == JsonToken.VALUE_NULL) {{",
+            f"{indent}        {items}.add(null);",
+            f"{indent}        continue;",
+            f"{indent}    }}",
+            *self._java_read_lines(type_expr.value, f"{items}.add(%s);", indent + "    ", depth + 1),
+            f"{indent}}}",
+            indent + store % items,
+        ]
 
-        return "\n".join(class_lines)
+    def _java_boxed_type(self, type_expr: TypeExpr) -> str:
+        """Java type usable in generics (boxed scalars, mixed values are objects)."""
+        if type_expr.kind == ARRAY:
+            return f"ArrayList<{self._java_boxed_type(type_expr.value)}>"
+        if type_expr.kind == MODEL:
+            return type_expr.value
+        return JAVA_BOXED_TYPES.get(type_expr.value, "Object") if type_expr.is_base else "Object"
 
-    def _generate_python_class(self, class_name: str, properties: dict):  # noqa: C901
+    def _generate_python_class(self, class_name: str, properties: dict):
         """Generates Python dataclass code with a from_dict method."""
-        lines = ["@dataclass", f"class {class_name}:"]
-
-        # Generate class fields
-        for prop_name, (prop_type, is_nullable, _) in properties.items():
-            python_prop = to_snake_case(prop_name)
-            prop_type = self._map_to_python_type(prop_type)
-            if is_nullable:
-                prop_type = f"Optional[{prop_type}]"
-            elif prop_type.startswith("array<"):
-                prop_type = prop_type.replace("array<", "List[")[:-1] + "]"
-
-            lines.append(f"    {python_prop}: {prop_type}")
-
-        # Handle empty class
-        if len(lines) == 1:
-            lines.append("    pass")
-
-        # Generate the from_dict static method
-        lines.append("\n    @staticmethod")
-        lines.append(f"    def from_dict(obj: Any) -> '{class_name}':")
-        from_dict_lines = []
-
-        # Create a mapping line for each property
-        for prop_name, (prop_type, is_nullable, type_set) in properties.items():
-            python_prop = to_snake_case(prop_name)
-            prop_type = self._map_to_python_type(prop_type)
-            if "array<" in prop_type:
-                nested_type = prop_type[6:-1]  # Extract type from 'array<NestedType>'
-                from_dict_lines.append(
-                    f"        _{python_prop} = ["
-                    f"{nested_type}.from_dict(item) if isinstance(item, dict) "
-                    f"else item for item in obj.get('{prop_name}', [])]"
-                )
-            elif prop_type.startswith("Optional["):
-                actual_type = prop_type[9:-1]
-                if actual_type == "Any":
-                    from_dict_lines.append(f"        _{python_prop} = obj.get('{prop_name}', None)")
-                elif actual_type in ["str", "int", "float", "bool"]:
-                    from_dict_lines.append(f"        _{python_prop} = obj.get('{prop_name}', None)")
-                elif actual_type == "list":
-                    from_dict_lines.append(f"        _{python_prop} = [v for v in obj.get('{prop_name}')]")
-                elif actual_type in self.models:
-                    from_dict_lines.append(
-                        f"        _{python_prop} = {actual_type}.from_dict(obj.get('{prop_name}')) "
-                        f"if obj.get('{python_prop}') is not None else None")
-                else:
-                    from_dict_lines.append(f"        _{python_prop} = obj.get('{prop_name}', None)")
-            elif prop_type == "Any":
-                from_dict_lines.append(f"        _{python_prop} = obj.get('{prop_name}')")
-            elif prop_type in ["str", "int", "float", "bool"]:
-                from_dict_lines.append(f"        _{python_prop} = {prop_type}(obj.get('{prop_name}'))")
-            elif prop_type == "list":
-                from_dict_lines.append(f"        _{python_prop} = [v for v in obj.get('{prop_name}')]")
-            elif prop_type in self.models:
-                from_dict_lines.append(f"        _{python_prop} = {prop_type}.from_dict(obj.get('{prop_name}'))")
-
-        # Join the mapped properties
-        lines.extend(from_dict_lines)
-        lines.append(f"        return {class_name}(")
-        lines.append(f"            {', '.join(f'_{to_snake_case(prop_name)}' for prop_name in properties.keys())}")
-        lines.append("        )")
-
-        return "\n".join(lines)
-
-    def _map_to_php_type(self, prop_type) -> str:
-        """Map internal types to PHP types."""
-        type_map = {
-            "int": "int",
-            "float": "float",
-            "bool": "bool",
-            "string": "string",
-            "array<int>": "array",
-            "array<bool>": "array",
-            "array<float>": "array",
-            "array<string>": "array",
-            "object": "object"
-        }
-        if isinstance(prop_type, set):
-            types = [self._map_to_php_type(subtype) for subtype in prop_type]
-            types.sort()
-            return "|".join(types)
-        return type_map.get(prop_type, prop_type)
-
-    def _map_to_java_type(self, prop_type):
-        """Map internal types to Java types."""
-        type_map = {
-            "int": "int",
-            "float": "double",
-            "bool": "boolean",
-            "string": "String",
-            "array<int>": "ArrayList<int>",
-            "array<bool>": "ArrayList<boolean>",
-            "array<float>": "ArrayList<double>",
-            "array<string>": "ArrayList<String>",
-            "object": "Object"
-        }
-        if isinstance(prop_type, set):
-            types = [self._map_to_java_type(subtype) for subtype in prop_type]
-            types.sort()
-            return "|".join(types)
-        return type_map.get(prop_type, prop_type).replace("array<", "ArrayList<")
-
-    def _map_to_python_type(self, prop_type):
-        """Map internal types to Python types."""
-        type_map = {
-            "int": "int",
-            "float": "float",
-            "bool": "bool",
-            "string": "str",
-            "array<int>": "list",
-            "array<bool>": "list",
-            "array<float>": "list",
-            "array<string>": "list",
-            "object": "dict",
-            "mixed": "Any"
-        }
-        return type_map.get(prop_type, prop_type)
+        return render("python/dataclass", self.config, class_name=class_name,
+                      properties=self._template_properties(properties, "snake"))
+
+    def _generate_python_fast_class(self, class_name: str, properties: dict):
+        """
+        Generates slotted Python dataclass code with from_dict (a single lookup per field),
+        to_dict and from_list (for top-level arrays) methods.
+        """
+        fast_properties = []
+        for key, name, _, type_expr, nullable in self._template_properties(properties, "snake"):
+            value = f"obj.get({key!r})" if nullable else f"obj[{key!r}]"
+            attribute = f"self.{name}"
+            if type_expr.is_model:
+                load, dump = f"{type_expr.value}.from_dict(%s)", "%s.to_dict()"
+            elif type_expr.is_array and type_expr.value.is_model:
+                load = f"[None if item is None else {type_expr.value.value}.from_dict(item) for item in %s]"
+                dump = "[None if item is None else item.to_dict() for item in %s]"
+            else:
+                # Base types, mixed values and arrays of them are taken as they are
+                load = dump = "%s"
+
+            if nullable and load != "%s":
+                # Walrus keeps a single lookup of the key
+                load, dump = f"None if (v := {value}) is None else {load % 'v'}", \
+                    f"None if {attribute} is None else {dump % attribute}"
+            else:
+                load, dump = load % value, dump % attribute
+            fast_properties.append((key, name, type_expr, nullable, load, dump))
+
+        return render("python/dataclass_fast_path", self.config, class_name=class_name,
+                      properties=fast_properties)
+
+    def _template_properties(self, properties: dict, case: str) -> list:
+        """Properties of the model for the templates: `(key, name in the case, type, type expression, nullable)`."""
+        names = convert_keys(properties, case)
+        type_expr = self._type_expr
+        return [
+            (key, names[key], prop_type, type_expr(prop_type, prop_types), nullable)
+            for key, (prop_type, nullable, prop_types) in properties.items()
+        ]
+
+    @staticmethod
+    def _type_expr(prop_type, prop_types) -> TypeExpr:
+        """Parsed property type ('mixed' is the union of its possible types)."""
+        return property_type(prop_type, prop_types)
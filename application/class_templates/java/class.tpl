@@ -0,0 +1,23 @@
+%% args class_name, properties
+%% if options.java_streaming_deserializers:
+@JsonDeserialize(using = {{ class_name }}Deserializer.class)
+%% end
+public class {{ class_name }} {
+% for key, name, expr, accessor in properties:
+%% if options.java_use_properties:
+%   field_type = java_type(expr)
+    @JsonProperty("{{ key }}")
+    public {{ field_type }} get{{ accessor }}() {
+        return this.{{ name }};
+    }
+    public void set{{ accessor }}({{ field_type }} {{ name }}) {
+        this.{{ name }} = {{ name }};
+    }
+    {{ field_type }} {{ name }};
+
+%% else:
+    @JsonProperty("{{ key }}")
+    public {{ java_type(expr) }} {{ name }};
+%% end
+% end
+}
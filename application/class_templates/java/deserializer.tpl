@@ -0,0 +1,42 @@
+%% args class_name, properties
+import com.fasterxml.jackson.core.JsonParser;
+import com.fasterxml.jackson.core.JsonToken;
+import com.fasterxml.jackson.databind.DeserializationContext;
+import com.fasterxml.jackson.databind.JsonDeserializer;
+import java.io.IOException;
+import java.util.ArrayList;
+
+public class {{ class_name }}Deserializer extends JsonDeserializer<{{ class_name }}> {
+    @Override
+    public {{ class_name }} deserialize(JsonParser parser, DeserializationContext context) throws IOException {
+        return read(parser, context);
+    }
+
+    public static {{ class_name }} read(JsonParser parser, DeserializationContext context) throws IOException {
+        JsonToken token = parser.currentToken();
+        if (token != JsonToken.START_OBJECT && token != JsonToken.FIELD_NAME) {
+            return ({{ class_name }}) context.handleUnexpectedToken({{ class_name }}.class, parser);
+        }
+        {{ class_name }} value = new {{ class_name }}();
+        String field = token == JsonToken.START_OBJECT ? parser.nextFieldName() : parser.currentName();
+        for (; field != null; field = parser.nextFieldName()) {
+            if (parser.nextToken() == JsonToken.VALUE_NULL) {
+                continue;
+            }
+            switch (field) {
+% for key, read_lines in properties:
+%# Cases share the switch scope, so each one gets a block for its local lists
+                case "{{ key }}": {
+%   for line in read_lines:
+                    {{ line }}
+%   end
+                    break;
+                }
+% end
+                default:
+                    parser.skipChildren();
+            }
+        }
+        return value;
+    }
+}
@@ -0,0 +1,42 @@
+%% args class_name, properties
+<?php declare(strict_types=1);
+
+namespace App\Model;
+
+%% if options.php_jms_annotation:
+use JMS\Serializer\Annotation as Serializer;
+
+%% end
+final class {{ class_name }}
+{
+% for key, name, prop_type, expr, nullable in properties:
+%% if options.php_old_version:
+    /**
+     * @var {{ 'null|' if nullable else '' }}{{ prop_type }}
+%% if options.php_jms_annotation:
+     *
+     * @Serializer\Type("{{ prop_type if expr.is_array else php_type(expr) }}")
+     * @Serializer\SerializedName("{{ key }}")
+%% end
+     */
+    public ${{ name }};
+
+%% else:
+%   if expr.is_array:
+    /** @var {{ prop_type }} */
+%% if options.php_jms_annotation:
+    #[Serializer\Type("{{ prop_type }}")]
+%   elif expr.is_union:
+    #[Serializer\Type("{{ php_type(expr) }}")]
+%% end
+%   end
+%% if options.php_jms_annotation:
+    #[Serializer\SerializedName("{{ key }}")]
+%% end
+    public {{ '?' if nullable else '' }}{{ php_type(expr) }} ${{ name }};
+%% if options.php_jms_annotation:
+
+%% end
+%% end
+% end
+}
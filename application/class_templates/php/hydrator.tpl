@@ -0,0 +1,28 @@
+%% args class_name, properties
+<?php declare(strict_types=1);
+
+namespace App\Model;
+
+final class {{ class_name }}Hydrator
+{
+    public static function hydrate(array $data): {{ class_name }}
+    {
+        $object = new {{ class_name }}();
+% for name, hydrated in properties:
+        $object->{{ name }} = {{ hydrated }};
+% end
+
+        return $object;
+    }
+
+    public static function hydrateNullable(?array $data): ?{{ class_name }}
+    {
+        return $data === null ? null : self::hydrate($data);
+    }
+
+    /** @return array<{{ class_name }}> */
+    public static function hydrateAll(array $items): array
+    {
+        return array_map([self::class, 'hydrate'], $items);
+    }
+}
@@ -0,0 +1,7 @@
+%% args class_names
+<?php declare(strict_types=1);
+
+// php.ini: opcache.preload=/path/to/preload.php
+% for class_name in class_names:
+opcache_compile_file(__DIR__ . '/{{ class_name }}.php');
+% end
@@ -0,0 +1,28 @@
+%% args class_name, properties
+@dataclass
+class {{ class_name }}:
+% for key, name, prop_type, expr, nullable in properties:
+    {{ name }}: {{ 'Optional[%s]' % python_type(expr) if nullable else python_type(expr) }}
+% end
+% if not properties:
+    pass
+% end
+
+    @staticmethod
+    def from_dict(obj: Any) -> '{{ class_name }}':
+% for key, name, prop_type, expr, nullable in properties:
+%   if expr.is_array and expr.value.is_model:
+        _{{ name }} = [{{ expr.value.value }}.from_dict(item) if isinstance(item, dict) else item for item in obj.get('{{ key }}', [])]
+%   elif expr.is_array:
+        _{{ name }} = [v for v in obj.get('{{ key }}')]
+%   elif expr.is_base:
+        _{{ name }} = {{ python_type(expr) }}(obj.get('{{ key }}'))
+%   elif expr.is_model:
+        _{{ name }} = {{ expr.value }}.from_dict(obj.get('{{ key }}'))
+%   else:
+        _{{ name }} = obj.get('{{ key }}')
+%   end
+% end
+        return {{ class_name }}(
+            {{ ', '.join(['_' + prop[1] for prop in properties]) }}
+        )
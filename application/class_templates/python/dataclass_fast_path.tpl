@@ -0,0 +1,26 @@
+%% args class_name, properties
+@dataclass
+class {{ class_name }}:
+    __slots__ = {{ repr(tuple(name for key, name, expr, nullable, load, dump in properties)) }}
+% for key, name, expr, nullable, load, dump in properties:
+    {{ name }}: {{ 'Optional[%s]' % python_type(expr) if nullable else python_type(expr) }}
+% end
+
+    @staticmethod
+    def from_dict(obj: Any) -> '{{ class_name }}':
+        return {{ class_name }}(
+% for key, name, expr, nullable, load, dump in properties:
+            {{ load }},
+% end
+        )
+
+    def to_dict(self) -> dict:
+        return {
+% for key, name, expr, nullable, load, dump in properties:
+            {{ repr(key) }}: {{ dump }},
+% end
+        }
+
+    @staticmethod
+    def from_list(items: List[Any]) -> List['{{ class_name }}']:
+        return list(map({{ class_name }}.from_dict, items))
@@ -0,0 +1,224 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from application.config import Config
+from application.converter import EXTENSIONS, LANGUAGES, convert_languages, generate_all_classes
+from application.json_parser import ArraySampling, parse_json_stream, parse_json_structures
+from application.samples import parse_ndjson
+
+# python -m application.cli fixtures/ -o models -l php -l java
+# python -m application.cli dumps/*.json --stream -j 1
+
+MANIFEST_FILE = ".jsonto-manifest.json"
+MINIMIZED_SUFFIX = ".min.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SAMPLE_SIZE = 1000
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def collect_inputs(patterns: list, suffixes: tuple = (".json",)) -> list:
+    """
+    Resolve files, globs and directories (searched recursively for files with the suffixes) to the list of
+    (input file, output name) pairs. Files ending with `.min.json` are minimized JSONs, not inputs.
+    """
+    inputs = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files = [(path, os.path.relpath(path, pattern))
+                     for suffix in suffixes
+                     for path in glob.glob(os.path.join(pattern, "**", f"*{suffix}"), recursive=True)]
+        else:
+            files = [(path, os.path.basename(path)) for path in glob.glob(pattern, recursive=True) or [pattern]]
+
+        for path, name in sorted(files):
+            if not path.endswith(MINIMIZED_SUFFIX):
+                inputs.setdefault(os.path.normpath(path), os.path.splitext(name)[0])
+
+    return list(inputs.items())
+
+
+def read_input(path: str, ndjson: bool = False, stream: bool = False) -> tuple:
+    """
+    Read the full JSON and the minimized one stored next to it (`name.min.json`) if any (not for NDJSON).
+    With `stream` the full JSON is not read (it's parsed from the file incrementally), None is returned instead.
+    """
+    full_json = None
+    if not stream:
+        with open(path, encoding="utf-8") as f:
+            full_json = f.read()
+
+    minimized_path = os.path.splitext(path)[0] + MINIMIZED_SUFFIX
+    minimized_json = ""
+    if not ndjson and os.path.isfile(minimized_path):
+        with open(minimized_path, encoding="utf-8") as f:
+            minimized_json = f.read()
+
+    return full_json, minimized_json
+
+
+def content_hash(path: str, ndjson: bool, languages: list, config: Config, sample_size: int = None) -> str:
+    """Hash of everything the generated classes of the input depend on (the input is read in chunks)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    digest.update(b"\0")
+    for part in (read_input(path, ndjson, stream=True)[1], json.dumps(languages),
+                 json.dumps(vars(config), sort_keys=True), str(sample_size)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def array_sampling(sample_size: int) -> ArraySampling:
+    """Sampling inspecting at most `sample_size` elements per array (a tenth from the head and the tail each)."""
+    edge = sample_size // 10
+    # Fixed seed, so the same input always gives the same classes
+    return ArraySampling(head=edge, tail=edge, reservoir=sample_size - 2 * edge, seed=0)
+
+
+def format_sampling_report(report: dict) -> list:
+    """Lines of the sampling coverage: JSON path, inspected elements and total length of the sampled arrays."""
+    return [f"sampled {path}: {coverage['inspected']} of {coverage['length']} elements in {coverage['arrays']} arrays"
+            for path, coverage in report.items()]
+
+
+def convert_file(task: tuple) -> tuple:
+    """
+    Generate classes for all languages (from a single parse) and write them to `output/language/name/`.
+    Runs in a worker process. NDJSON samples (if `ndjson_jobs` is set) are parsed
+    in `ndjson_jobs` processes instead. With `stream` the JSON is parsed from the file incrementally
+    (see `parse_json_stream`), so large documents don't need memory for the whole object tree.
+    With `sample_size` long arrays are sampled (see `array_sampling`).
+    Returns input path, error message in case error and the sampling coverage report.
+    """
+    path, name, output, languages, config, ndjson_jobs, stream, sample_size = task
+    sampling = array_sampling(sample_size) if sample_size else None
+    full_json, minimized_json = read_input(path, ndjson_jobs is not None, stream or ndjson_jobs is not None)
+    if ndjson_jobs is not None:
+        # Samples are read line by line
+        with open(path, encoding="utf-8") as f:
+            models, error = parse_ndjson(f, config, ndjson_jobs)
+        language_classes = generate_all_classes(models, config, languages)
+    elif stream:
+        with open(path, "rb") as f:
+            models, error = parse_json_stream(f, minimized_json, config)
+        language_classes = generate_all_classes(models, config, languages)
+    elif sampling:
+        models, error = parse_json_structures(full_json, minimized_json, config, sampling)
+        language_classes = generate_all_classes(models, config, languages)
+    else:
+        language_classes, error = convert_languages(full_json, config, languages, minimized_json)
+    report = sampling.report if sampling else {}
+    if error:
+        return path, error, report
+
+    for language, classes in language_classes.items():
+        target = os.path.join(output, language, name)
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(target)
+        for class_name, class_content in classes.items():
+            with open(os.path.join(target, f"{class_name}.{EXTENSIONS[language]}"), "w", encoding="utf-8") as f:
+                f.write(class_content)
+
+    return path, None, report
+
+
+def load_manifest(output: str) -> dict:
+    """Load hashes of the inputs converted by the previous run."""
+    try:
+        with open(os.path.join(output, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output: str, manifest: dict):
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m application.cli",
+                                     description="Convert JSON samples to PHP, Java and Python classes/models.")
+    parser.add_argument("inputs", nargs="+", help="JSON files, globs or directories")
+    parser.add_argument("-o", "--output", default="models", help="output directory (default: models)")
+    parser.add_argument("-l", "--language", action="append", choices=LANGUAGES,
+                        help="language to generate, may be repeated (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-f", "--force", action="store_true", help="convert unchanged inputs too")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--ndjson", action="store_true",
+                      help="inputs are NDJSON files (*.ndjson, *.jsonl) with one sample per line, "
+                           "keys missing in some samples are nullable")
+    mode.add_argument("--stream", action="store_true",
+                      help="parse the JSON files incrementally without loading them (large documents)")
+    mode.add_argument("--sample-arrays", type=int, nargs="?", const=DEFAULT_SAMPLE_SIZE, metavar="SIZE",
+                      help="inspect only SIZE elements of longer arrays: head, tail and a random sample "
+                           f"(default SIZE: {DEFAULT_SAMPLE_SIZE}), the coverage is reported")
+    parser.add_argument("--common-with-prefixes", action="store_true",
+                        help="add the parent model name as a prefix to the submodel name")
+    parser.add_argument("--php-jms-annotation", action="store_true", help="add JMS Serializer annotations")
+    parser.add_argument("--php-old-version", action="store_true", help="old PHP version style")
+    parser.add_argument("--php-hydrators", action="store_true",
+                        help="generate plain PHP hydrators and an opcache preload script")
+    parser.add_argument("--java-use-properties", action="store_true", help="use setters and getters")
+    parser.add_argument("--java-streaming-deserializers", action="store_true",
+                        help="generate Jackson deserializers driven by the streaming parser")
+    parser.add_argument("--python-fast-path", action="store_true",
+                        help="slotted dataclasses with single-lookup from_dict, to_dict and from_list")
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    languages = args.language or list(LANGUAGES)
+    config = Config(common_with_prefixes=args.common_with_prefixes, php_jms_annotation=args.php_jms_annotation,
+                    php_old_version=args.php_old_version, php_hydrators=args.php_hydrators,
+                    java_use_properties=args.java_use_properties,
+                    java_streaming_deserializers=args.java_streaming_deserializers,
+                    python_fast_path=args.python_fast_path)
+
+    # NDJSON samples of every file are split between the workers instead of the files
+    ndjson_jobs = args.jobs if args.ndjson else None
+    manifest = load_manifest(args.output)
+    hashes, tasks, failed = {}, [], 0
+    for path, name in collect_inputs(args.inputs, NDJSON_SUFFIXES if args.ndjson else (".json",)):
+        if not os.path.isfile(path):
+            failed += 1
+            print(f"{path}: Error: file not found", file=sys.stderr)
+            continue
+        hashes[path] = content_hash(path, args.ndjson, languages, config, args.sample_arrays)
+        if args.force or manifest.get(path) != hashes[path]:
+            tasks.append((path, name, args.output, languages, config, ndjson_jobs, args.stream, args.sample_arrays))
+
+    if args.jobs > 1 and len(tasks) > 1 and not args.ndjson:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(convert_file, tasks))
+    else:
+        results = [convert_file(task) for task in tasks]
+
+    for path, error, report in results:
+        for line in format_sampling_report(report):
+            print(f"{path}: {line}")
+        if error:
+            failed += 1
+            manifest.pop(path, None)
+            print(f"{path}: {error}", file=sys.stderr)
+        else:
+            manifest[path] = hashes[path]
+    save_manifest(args.output, manifest)
+
+    converted = sum(1 for _, error, _ in results if not error)
+    print(f"Converted: {converted}, unchanged: {len(hashes) - len(results)}, failed: {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
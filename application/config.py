@@ -1,13 +1,41 @@
-from flask import request
-
-
 class Config:
     """
     Configuration class to store classes generation preferences.
     """
 
-    def __init__(self):
-        self.common_with_prefixes = True if request.form.get("common_with_prefixes", None) == "enabled" else False
-        self.php_jms_annotation = True if request.form.get("php_jms_annotation", None) == "enabled" else False
-        self.php_old_version = True if request.form.get("php_old_version", None) == "enabled" else False
-        self.java_use_properties = True if request.form.get("java_use_properties", None) == "enabled" else False
+    def __init__(self, common_with_prefixes: bool = False, php_jms_annotation: bool = False,
+                 php_old_version: bool = False, php_hydrators: bool = False, java_use_properties: bool = False,
+                 java_streaming_deserializers: bool = False, python_fast_path: bool = False):
+        self.common_with_prefixes = common_with_prefixes
+        self.php_jms_annotation = php_jms_annotation
+        self.php_old_version = php_old_version
+        self.php_hydrators = php_hydrators
+        self.java_use_properties = java_use_properties
+        self.java_streaming_deserializers = java_streaming_deserializers
+        self.python_fast_path = python_fast_path
+
+    @classmethod
+    def from_dict(cls, options: dict) -> "Config":
+        """Build configuration from a dictionary of boolean options (e.g. a JSON request), rejecting unknown ones."""
+        if not isinstance(options, dict):
+            raise ValueError("Options must be an object.")
+        known_options = vars(cls())
+        for name, value in options.items():
+            if name not in known_options:
+                raise ValueError(f"Unknown option '{name}'.")
+            if not isinstance(value, bool):
+                raise ValueError(f"Option '{name}' must be true or false.")
+        return cls(**options)
+
+    @classmethod
+    def from_form(cls, form) -> "Config":
+        """Build configuration from the submitted form (checkboxes send "enabled")."""
+        return cls(
+            common_with_prefixes=form.get("common_with_prefixes", None) == "enabled",
+            php_jms_annotation=form.get("php_jms_annotation", None) == "enabled",
+            php_old_version=form.get("php_old_version", None) == "enabled",
+            php_hydrators=form.get("php_hydrators", None) == "enabled",
+            java_use_properties=form.get("java_use_properties", None) == "enabled",
+            java_streaming_deserializers=form.get("java_streaming_deserializers", None) == "enabled",
+            python_fast_path=form.get("python_fast_path", None) == "enabled",
+        )
@@ -0,0 +1,88 @@
+from application.class_generator import ClassGenerator
+from application.config import Config
+from application.json_parser import Budget, parse_json_structures, parse_json_values
+from application.samples import parse_ndjson
+
+LANGUAGES = ("php", "java", "python")
+EXTENSIONS = {"php": "php", "java": "java", "python": "py"}
+
+
+def generate_classes(models: dict, options: Config = None, language: str = "php") -> dict:
+    """Generate classes for the language from the inferred models."""
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language '{language}'.")
+
+    return getattr(ClassGenerator(models, options), f"generate_{language}_classes")()
+
+
+def generate_all_classes(models: dict, options: Config = None, languages=LANGUAGES) -> dict:
+    """Generate classes for each of the languages from the same inferred models: language => classes."""
+    for language in languages:
+        if language not in LANGUAGES:
+            raise ValueError(f"Unknown language '{language}'.")
+
+    # Emitters share the generator (and the models), each one only reads them
+    generator = ClassGenerator(models, options)
+    return {language: getattr(generator, f"generate_{language}_classes")() for language in languages}
+
+
+def convert(json_text: str, options: Config = None, language: str = "php", minimized_json_text: str = "",
+            budget: Budget = None) -> tuple:
+    """
+    Infer models from JSON and generate classes for the language.
+    Doesn't depend on Flask, so it can run in worker threads, subprocesses or batch jobs.
+    The inference stops at the first limit of the budget exceeded (see `Budget`).
+    Returns generated classes dictionary and error message in case error.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language '{language}'.")
+
+    models, error = parse_json_structures(json_text, minimized_json_text, options, budget=budget)
+
+    return generate_classes(models, options, language), error
+
+
+def convert_languages(json_text: str, options: Config = None, languages=LANGUAGES,
+                      minimized_json_text: str = "", budget: Budget = None) -> tuple:
+    """
+    Infer models from JSON once and generate classes for each of the languages.
+    Returns language => generated classes dictionary and error message in case error.
+    """
+    for language in languages:
+        if language not in LANGUAGES:
+            raise ValueError(f"Unknown language '{language}'.")
+
+    models, error = parse_json_structures(json_text, minimized_json_text, options, budget=budget)
+
+    return generate_all_classes(models, options, languages), error
+
+
+def convert_document(document, options: Config = None, languages=LANGUAGES, minimized_document=None,
+                     budget: Budget = None) -> tuple:
+    """
+    `convert_languages` for a JSON document that is already decoded (JSON text strings are parsed as usual).
+    Returns language => generated classes dictionary and error message in case error.
+    """
+    if isinstance(document, str):
+        return convert_languages(document, options, languages, minimized_document or "", budget)
+
+    for language in languages:
+        if language not in LANGUAGES:
+            raise ValueError(f"Unknown language '{language}'.")
+
+    models, error = parse_json_values(document, minimized_document, options, budget)
+
+    return generate_all_classes(models, options, languages), error
+
+
+def convert_samples(ndjson_text: str, options: Config = None, language: str = "php", jobs: int = 1) -> tuple:
+    """
+    Infer models from many JSON samples (NDJSON, see `parse_ndjson`) and generate classes for the language.
+    Returns generated classes dictionary and error message in case error.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language '{language}'.")
+
+    models, error = parse_ndjson(ndjson_text, options, jobs)
+
+    return generate_classes(models, options, language), error
@@ -0,0 +1,116 @@
+import os
+import re
+from functools import lru_cache
+from application.config import Config
+from application.type_expr import to_java_type, to_php_type, to_python_type
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "class_templates")
+TEMPLATE_SUFFIX = ".tpl"
+PLACEHOLDER_RE = re.compile(r"\{\{(.+?)\}\}")
+
+# Functions available to the template expressions
+TEMPLATE_GLOBALS = {"php_type": to_php_type, "java_type": to_java_type, "python_type": to_python_type}
+
+
+def _f_string(line: str) -> str:
+    """Source of the f-string rendering a template line (`{{ expression }}` placeholders, the rest is literal)."""
+    parts = PLACEHOLDER_RE.split(line)
+    for i in range(0, len(parts), 2):
+        parts[i] = parts[i].replace("\\", "\\\\").replace('"', '\\"').replace("{", "{{").replace("}", "}}")
+    for i in range(1, len(parts), 2):
+        parts[i] = f"{{({parts[i].strip()})}}"
+    return 'f"' + "".join(parts) + '"'
+
+
+def compile_template(source: str, options: Config, name: str = "template"):  # noqa: C901
+    """
+    Compile the template for the options into a function rendering it (keyword arguments are listed by `%% args`).
+    Lines are rendered as they are, except:
+        `{{ expression }}` => value of the Python expression (single quotes only)
+        `%# comment` => nothing
+        `% statement:` ... `% end` => Python block (`if`, `elif`, `else`, `for`) around the lines
+        `%% if condition:` ... `%% else:` ... `%% end` => lines kept or dropped when the template is compiled,
+            the condition sees the `options`
+    """
+    code = []
+    depth = 1
+    included = []
+    args = ""
+
+    for line_number, line in enumerate(source.splitlines(), start=1):
+        if line.startswith("%%"):
+            directive = line[2:].strip()
+            if directive.startswith("args "):
+                args = directive[5:]
+            elif directive.startswith("if ") and directive.endswith(":"):
+                included.append(bool(eval(directive[3:-1], {}, {"options": options})))
+            elif directive == "else:" and included:
+                included[-1] = not included[-1]
+            elif directive == "end" and included:
+                included.pop()
+            else:
+                raise ValueError(f"Invalid template directive '{line}' ({name}, line {line_number}).")
+            continue
+
+        if not all(included) or line.startswith("%#"):
+            continue
+
+        if line.startswith("%"):
+            statement = line[1:].strip()
+            if statement == "end" or statement.startswith(("elif ", "else:")):
+                depth -= 1
+                if depth < 1:
+                    raise ValueError(f"Unexpected '{line}' ({name}, line {line_number}).")
+            if statement != "end":
+                code.append("    " * depth + statement)
+                if statement.endswith(":"):
+                    depth += 1
+                    # Blocks may have no lines left for the options
+                    code.append("    " * depth + "pass")
+        else:
+            code.append("    " * depth + f"_append({_f_string(line)})")
+
+    if depth != 1 or included:
+        raise ValueError(f"Unclosed block in template ({name}).")
+
+    source_code = "\n".join([f"def render(*, {args}):", "    lines = []", "    _append = lines.append",
+                             *code, '    return "\\n".join(lines)'])
+    namespace = dict(TEMPLATE_GLOBALS)
+    exec(compile(source_code, f"<{name}>", "exec"), namespace)
+    return namespace["render"]
+
+
+@lru_cache(maxsize=None)
+def _read_template(name: str) -> str:
+    with open(os.path.join(TEMPLATES_DIR, name + TEMPLATE_SUFFIX), encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str, options: tuple):
+    """Template (e.g. `php/class`) compiled for the options (items of the configuration), cached."""
+    return compile_template(_read_template(name), Config(**dict(options)), name)
+
+
+def render(name: str, options: Config, **context) -> str:
+    """Render the template compiled for the options."""
+    return get_template(name, tuple(vars(options).items()))(**context)
+
+
+def template_names() -> list:
+    """Names of all the templates (`language/name`)."""
+    return sorted(
+        f"{language}/{file_name[:-len(TEMPLATE_SUFFIX)]}"
+        for language in os.listdir(TEMPLATES_DIR)
+        for file_name in os.listdir(os.path.join(TEMPLATES_DIR, language))
+        if file_name.endswith(TEMPLATE_SUFFIX)
+    )
+
+
+def compile_templates(options: Config = None) -> list:
+    """Compile all the templates for the options ahead of the first generation (e.g. at application startup)."""
+    options = options if options is not None else Config()
+    names = template_names()
+    for name in names:
+        get_template(name, tuple(vars(options).items()))
+    return names
@@ -0,0 +1,142 @@
+import multiprocessing
+import queue
+import threading
+from time import monotonic
+
+# Workers are forked from a clean server process (the web server has threads), with the converter imported once
+FORKSERVER_PRELOAD = ["application.converter", "application.api"]
+
+
+class PoolSaturated(Exception):
+    """Raised when the pool can't take more jobs, so the load is shed instead of queued."""
+
+
+def _serve(connection):
+    """Worker process loop: run `(function, args)` jobs and send back `(ok, result or exception)`."""
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+        try:
+            reply = True, function(*args)
+        except Exception as e:
+            reply = False, e
+        connection.send(reply)
+
+
+class _Worker:
+    """Worker process with its end of the job pipe."""
+
+    def __init__(self, context):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """
+    Bounded pool of worker processes running the CPU-bound conversions out of the request threads.
+    Every job has a deadline (including the wait for a free worker): a job running past it is killed
+    with its worker (a new one is started for the next job), so one pathological payload can't hold a worker.
+    At most `max_waiting` jobs wait for a free worker (unlimited if None), the next ones are rejected right away.
+    Workers are started on first use. With no workers jobs run inline (no deadline), admitted as if there was one.
+    """
+
+    def __init__(self, workers: int, deadline: float = None, max_waiting: int = None):
+        self.workers = workers
+        self.deadline = deadline
+        self.max_waiting = max_waiting
+        self._context = None
+        # Jobs running or waiting for a worker
+        self._jobs = 0
+        # Idle workers (None => not started yet), so at most `workers` jobs run at once
+        self._idle = queue.LifoQueue()
+        for _ in range(workers):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._started = []
+
+    def _get_context(self):
+        with self._lock:
+            if self._context is None:
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    self._context = multiprocessing.get_context("forkserver")
+                    self._context.set_forkserver_preload(FORKSERVER_PRELOAD)
+                else:
+                    self._context = multiprocessing.get_context("spawn")
+            return self._context
+
+    def run(self, function, *args, deadline: float = None):
+        """
+        Run `function(*args)` (both picklable) in a worker and return its result, exceptions are re-raised.
+        Raises TimeoutError if the job doesn't finish before the deadline (the pool's one by default),
+        RuntimeError if the worker dies and PoolSaturated if too many jobs are waiting already.
+        """
+        # Inline jobs count as running on a single worker
+        slots = self.workers or 1
+        with self._lock:
+            if self.max_waiting is not None and self._jobs >= slots + self.max_waiting:
+                raise PoolSaturated(f"All {slots} conversion workers are busy, try again later.")
+            self._jobs += 1
+        try:
+            if not self.workers:
+                return function(*args)
+            return self._run(function, args, deadline)
+        finally:
+            with self._lock:
+                self._jobs -= 1
+
+    def _run(self, function, args: tuple, deadline: float = None):
+        deadline = self.deadline if deadline is None else deadline
+        expires = None if deadline is None else monotonic() + deadline
+        try:
+            worker = self._idle.get(timeout=deadline)
+        except queue.Empty:
+            raise TimeoutError(f"No conversion worker became free in {deadline:g} seconds.") from None
+
+        finished = True
+        try:
+            if worker is None:
+                worker = _Worker(self._get_context())
+                self._started.append(worker)
+            worker.connection.send((function, args))
+            finished = worker.connection.poll(None if expires is None else max(expires - monotonic(), 0))
+            if finished:
+                ok, result = worker.connection.recv()
+        except (EOFError, OSError):
+            self._discard(worker)
+            worker = None
+            raise RuntimeError("Conversion worker crashed.") from None
+        finally:
+            if not finished:
+                self._discard(worker)
+                worker = None
+            self._idle.put(worker)
+
+        if not finished:
+            raise TimeoutError(f"Conversion took longer than {deadline:g} seconds.")
+        if not ok:
+            raise result
+        return result
+
+    def _discard(self, worker: _Worker):
+        if worker in self._started:
+            worker.kill()
+            self._started.remove(worker)
+
+    def close(self):
+        """Stop the started workers (jobs still running are killed), new ones are started on next use."""
+        for worker in list(self._started):
+            self._discard(worker)
+        idle = []
+        while not self._idle.empty():
+            idle.append(self._idle.get())
+        for worker in idle:
+            self._idle.put(None if worker not in self._started else worker)
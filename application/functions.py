@@ -1,4 +1,80 @@
 import re
+from functools import lru_cache
+
+import inflect
+
+# Precomputed singular forms of common API collection names (same as inflect gives)
+SINGULAR_NOUNS = {
+    "Accounts": "Account",
+    "Addresses": "Address",
+    "Attachments": "Attachment",
+    "Attributes": "Attribute",
+    "Categories": "Category",
+    "Children": "Child",
+    "Cities": "City",
+    "Comments": "Comment",
+    "Companies": "Company",
+    "Contacts": "Contact",
+    "Countries": "Country",
+    "Currencies": "Currency",
+    "Customers": "Customer",
+    "Data": "Datum",
+    "Documents": "Document",
+    "Edges": "Edge",
+    "Emails": "Email",
+    "Employees": "Employee",
+    "Entries": "Entry",
+    "Errors": "Error",
+    "Events": "Event",
+    "Features": "Feature",
+    "Fields": "Field",
+    "Files": "File",
+    "Groups": "Group",
+    "Hits": "Hit",
+    "Images": "Image",
+    "Issues": "Issue",
+    "Items": "Item",
+    "Languages": "Language",
+    "Lines": "Line",
+    "Links": "Link",
+    "Members": "Member",
+    "Messages": "Message",
+    "Nodes": "Node",
+    "Options": "Option",
+    "Orders": "Order",
+    "Payments": "Payment",
+    "People": "Person",
+    "Permissions": "Permission",
+    "Phones": "Phone",
+    "Photos": "Photo",
+    "Posts": "Post",
+    "Prices": "Price",
+    "Products": "Product",
+    "Projects": "Project",
+    "Properties": "Property",
+    "Records": "Record",
+    "Results": "Result",
+    "Reviews": "Review",
+    "Roles": "Role",
+    "Rows": "Row",
+    "Settings": "Setting",
+    "Statuses": "Status",
+    "Tags": "Tag",
+    "Tasks": "Task",
+    "Teams": "Team",
+    "Transactions": "Transaction",
+    "Users": "User",
+    "Values": "Value",
+    "Variants": "Variant",
+    "Videos": "Video",
+}
+
+SEPARATORS_RE = re.compile(r'[-\s]')
+WORDS_RE = re.compile(
+    r'[A-Z]+(?=[A-Z][a-z]|[0-9]|\b)|'  # acronyms (HTTP, XML, ID)
+    r'[A-Z][a-z0-9]*|'
+    r'[a-z0-9]+'
+)
 
 
 def split_words(name: str):
@@ -10,15 +86,10 @@ def split_words(name: str):
         return []
 
     # Replace separators with underscore
-    s = re.sub(r'[-\s]', '_', name)
+    s = SEPARATORS_RE.sub('_', name)
 
     # Split into words while keeping acronyms
-    return re.findall(
-        r'[A-Z]+(?=[A-Z][a-z]|[0-9]|\b)|'  # acronyms (HTTP, XML, ID)
-        r'[A-Z][a-z0-9]*|'
-        r'[a-z0-9]+',
-        s
-    )
+    return WORDS_RE.findall(s)
 
 
 def normalize_word(word: str, upper_first: bool) -> str:
@@ -30,21 +101,53 @@ def normalize_word(word: str, upper_first: bool) -> str:
     return word.lower()
 
 
+@lru_cache(maxsize=65536)
+def convert_case(name: str, case: str) -> str:
+    """Convert name to 'camel', 'pascal' or 'snake' case (results are memoized for all cases)."""
+    words = split_words(name)
+    if case == "camel":
+        if not words:
+            return ""
+        return words[0].lower() + ''.join(normalize_word(w, True) for w in words[1:])
+    elif case == "pascal":
+        return ''.join(normalize_word(w, True) for w in words)
+    elif case == "snake":
+        return '_'.join(w.lower() for w in words)
+    raise ValueError(f"Unknown case '{case}'.")
+
+
+def convert_keys(keys, case: str) -> dict:
+    """Convert all keys (e.g. model properties) to the case in one pass: key => converted name."""
+    return {key: convert_case(key, case) for key in keys}
+
+
 def to_camel_case(name: str) -> str:
     """Convert name to camel case."""
-    words = split_words(name)
-    if not words:
-        return ""
-    return words[0].lower() + ''.join(normalize_word(w, True) for w in words[1:])
+    return convert_case(name, "camel")
 
 
 def to_pascal_case(name: str) -> str:
     """Convert name to pascal case."""
-    words = split_words(name)
-    return ''.join(normalize_word(w, True) for w in words)
+    return convert_case(name, "pascal")
 
 
 def to_snake_case(name: str) -> str:
     """Convert name to snake case."""
-    words = split_words(name)
-    return '_'.join(w.lower() for w in words)
+    return convert_case(name, "snake")
+
+
+@lru_cache(maxsize=None)
+def inflect_engine() -> inflect.engine:
+    """Single inflect engine for the process (building it is expensive)."""
+    return inflect.engine()
+
+
+@lru_cache(maxsize=4096)
+def _singular_noun(name: str) -> str:
+    singular = inflect_engine().singular_noun(name)
+    return singular if singular else name
+
+
+def to_singular(name: str) -> str:
+    """Convert name to singular (name is returned as is if it's singular already)."""
+    return SINGULAR_NOUNS.get(name) or _singular_noun(name)
@@ -1,24 +1,105 @@
 import json
-import inflect
+import random
 from application.config import Config
-from application.functions import to_pascal_case
+from application.functions import to_pascal_case, to_singular
+from application.json_stream import DEFAULT_CHUNK_SIZE, iter_events, loads
+from application.model import Property
+
+
+class ArraySampling:
+    """
+    Opt-in sampling of long arrays: only the head, the tail and a random sample (reservoir)
+    of the middle part are inspected. Coverage is collected to the report:
+        key => JSON path of the array ("$.data[*].items")
+        value => dictionary with number of sampled arrays, their total length and inspected elements
+    """
+
+    def __init__(self, head: int = 100, tail: int = 100, reservoir: int = 800, seed=None):
+        self.head = head
+        self.tail = tail
+        self.reservoir = reservoir
+        self.random = random.Random(seed)
+        self.report = {}
+
+    @property
+    def size(self) -> int:
+        """Maximum number of elements inspected per array."""
+        return self.head + self.tail + self.reservoir
+
+    def sample(self, values: list, path: str) -> list:
+        """Return the elements to inspect (the array itself if it fits the budget)."""
+        if len(values) <= self.size:
+            return values
+
+        middle = sorted(self.random.sample(range(self.head, len(values) - self.tail), self.reservoir))
+        sampled = values[:self.head] + [values[i] for i in middle] + values[len(values) - self.tail:]
+
+        coverage = self.report.setdefault(path, {"arrays": 0, "length": 0, "inspected": 0})
+        coverage["arrays"] += 1
+        coverage["length"] += len(values)
+        coverage["inspected"] += len(sampled)
+
+        return sampled
+
+
+class Budget:
+    """
+    Opt-in limits of the inference work (None => unlimited), parsing stops with ValueError at the first one exceeded:
+        max_bytes => size of each JSON text
+        max_depth => nesting depth of objects and arrays (the root object is at depth 1)
+        max_keys => total number of keys of the parsed objects (equal array elements are parsed once)
+        max_array_length => number of elements of an array
+        max_models => number of generated models
+    """
+
+    def __init__(self, max_bytes: int = None, max_depth: int = None, max_keys: int = None,
+                 max_array_length: int = None, max_models: int = None):
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_keys = max_keys
+        self.max_array_length = max_array_length
+        self.max_models = max_models
+
+    def check_bytes(self, text):
+        # Characters are counted first, so only texts close to the limit are encoded
+        if self.max_bytes is not None and (len(text) > self.max_bytes or (
+                isinstance(text, str) and len(text.encode()) > self.max_bytes)):
+            raise ValueError(f"JSON is larger than {self.max_bytes} bytes.")
+
+    def check_depth(self, depth: int):
+        if self.max_depth is not None and depth > self.max_depth:
+            raise ValueError(f"JSON is nested deeper than {self.max_depth} levels.")
+
+    def check_keys(self, keys: int):
+        if self.max_keys is not None and keys > self.max_keys:
+            raise ValueError(f"JSON has more than {self.max_keys} keys.")
+
+    def check_array_length(self, values: list):
+        if self.max_array_length is not None and len(values) > self.max_array_length:
+            raise ValueError(f"JSON has an array longer than {self.max_array_length} elements.")
+
+    def check_models(self, models: int):
+        if self.max_models is not None and models > self.max_models:
+            raise ValueError(f"JSON needs more than {self.max_models} models.")
 
 
 class JSONParser:
     """
     Parse JSON object to the dictionary structure:
         key => model name
-        value => tuple with base model type (str), nullable (bool) and set of possible types (set)
+        value => dictionary of properties (key => Property with base type, nullable and possible types)
     """
 
-    def __init__(self):
+    def __init__(self, config: Config = None, sampling: ArraySampling = None):
         self.models = {}
-        self.config = Config()
+        self.config = config if config is not None else Config()
+        self.sampling = sampling
         self.base_types = {"int", "string", "bool", "float"}
+        self.scalar_types = self.base_types | {"mixed"}
 
     @staticmethod
-    def detect_type(value) -> str:
-        """Detect the data type."""
+    def detect_type(value, sampling: ArraySampling = None, path: str = "$") -> str:  # noqa: C901
+        """Detect the data type (inspecting only sampled elements of long arrays if sampling is given)."""
         if isinstance(value, bool):
             return "bool"
         elif isinstance(value, int):
@@ -28,8 +109,13 @@ class JSONParser:
         elif isinstance(value, str):
             return "string"
         elif isinstance(value, list):
-            # Handle arrays of objects and base types
-            detected_types = {JSONParser.detect_type(v) for v in value if v is not None}
+            # Handle arrays of objects and base types (stop as soon as the array is mixed)
+            detected_types = set()
+            for v in (sampling.sample(value, path) if sampling else value):
+                if v is not None:
+                    detected_types.add(JSONParser.detect_type(v, sampling, f"{path}[*]"))
+                    if len(detected_types) > 1:
+                        return "array<mixed>"
             if len(detected_types) == 1:
                 return f"array<{detected_types.pop()}>"
             else:
@@ -39,32 +125,59 @@ class JSONParser:
         else:
             raise ValueError(f"Unknown type for value '{value}'.")
 
+    @staticmethod
+    def fingerprint(value):
+        """
+        Structural fingerprint (keys and value kinds). Values with equal fingerprints
+        are merged into the model identically, so repeated ones can be skipped.
+        """
+        if isinstance(value, dict):
+            return tuple((key, JSONParser.fingerprint(item)) for key, item in value.items())
+        elif isinstance(value, list):
+            return frozenset(JSONParser.fingerprint(item) for item in value)
+        return type(value)
+
+    def _sub_model_name(self, model_name: str, key: str, singular: bool = False) -> str:
+        """Build a sub-model name for the nested object (or array of objects) stored under the key."""
+        sub_model_name = f"{model_name}{to_pascal_case(key)}" if self.config.common_with_prefixes \
+            else to_pascal_case(key)
+        if singular:
+            # Create singular noun for the model name (in case list of elements)
+            sub_model_name = to_singular(sub_model_name)
+        return sub_model_name
+
     def _merge_property(self, model_name: str, key: str, new_type: str, is_nullable: bool):
         """Merge a property into the existing model structure, handling type conflicts."""
-        if key in self.models[model_name]:
+        prop = self.models[model_name].get(key)
+        if prop is not None:
             # If the model exists, merge the types and update nullable status
-            existing_type, existing_nullable, type_set = self.models[model_name][key]
-            new_nullable = existing_nullable or is_nullable
+            existing_type = prop.type
 
-            # Check for conflict between base type and object/array
-            if (existing_type not in self.base_types and new_type in self.base_types) or \
-                    (new_type not in self.base_types and existing_type in self.base_types):
+            # Check for conflict between base type and object/array ('mixed' is made of base types only)
+            if (existing_type not in self.scalar_types and new_type in self.scalar_types) or \
+                    (new_type not in self.scalar_types and existing_type in self.scalar_types):
                 raise ValueError(f"Type conflict for key '{key}': cannot combine '{existing_type}' with '{new_type}'.")
 
             # If the types differ, add both to the set of types
             if new_type != existing_type:
-                type_set.add(new_type)
+                prop.add_type(new_type)
 
             # If there are multiple base types, set the main type as 'mixed'
-            if len(type_set) > 1 and (existing_type in self.base_types or new_type in self.base_types):
-                existing_type = 'mixed'
+            if prop.has_multiple_types and (existing_type in self.base_types or new_type in self.base_types):
+                prop.type = 'mixed'
 
-            self.models[model_name][key] = (existing_type, new_nullable, type_set)
+            prop.nullable = prop.nullable or is_nullable
         else:
             # Add new model property
-            self.models[model_name][key] = (new_type, is_nullable, {new_type})
+            self.models[model_name][key] = Property(new_type, is_nullable)
 
-    def parse_model(self, obj, minimized_obj, model_name: str = "RootModel") -> dict:
+    def _merge_null(self, model_name: str, key: str):
+        """Update nullable status of the existing property (null of a new one has no type to detect)."""
+        if key not in self.models[model_name]:
+            self.detect_type(None)
+        self._merge_property(model_name, key, self.models[model_name][key].type, True)
+
+    def parse_model(self, obj, minimized_obj, model_name: str = "RootModel", path: str = "$") -> dict:
         """Parse a given object and update the model data."""
         if model_name not in self.models:
             self.models[model_name] = {}
@@ -72,32 +185,36 @@ class JSONParser:
         for key, value in obj.items():
             # If no value and the model exists, update nullable status
             if value is None and key in self.models[model_name]:
-                existing_type, existing_nullable, type_set = self.models[model_name][key]
-                self._merge_property(model_name, key, existing_type, True)
+                self._merge_property(model_name, key, self.models[model_name][key].type, True)
                 continue
 
-            detected_type = self.detect_type(value)
+            value_path = f"{path}.{key}"
+            if isinstance(value, list) and self.sampling:
+                # Sample once, so the same elements are used for type detection and merging
+                value = self.sampling.sample(value, value_path)
+
+            detected_type = self.detect_type(value, self.sampling, value_path)
             is_nullable = key not in minimized_obj  # Mark nullable if the key is not in minimized JSON
 
             if detected_type == "object" and isinstance(value, dict):
                 # Recursively parse nested objects (sub-models)
-                sub_model_name = f"{model_name}{to_pascal_case(key)}" if self.config.common_with_prefixes \
-                    else to_pascal_case(key)
+                sub_model_name = self._sub_model_name(model_name, key)
                 minimized_sub_obj = minimized_obj.get(key, {})
-                self.parse_model(value, minimized_sub_obj, sub_model_name)
+                self.parse_model(value, minimized_sub_obj, sub_model_name, value_path)
                 current_type = sub_model_name
             elif detected_type == "array<object>" and isinstance(value, list) and len(value) > 0:
                 # Detect arrays of objects and create a nested model class for them
-                sub_model_name = f"{model_name}{to_pascal_case(key)}" if self.config.common_with_prefixes \
-                    else to_pascal_case(key)
-                # Use inflect to create singular noun for the model name (in case list of elements)
-                sub_model_name_singular = inflect.engine().singular_noun(sub_model_name)
-                sub_model_name = sub_model_name_singular if sub_model_name_singular else sub_model_name
-                # Process each object in the array and merge its structure
+                sub_model_name = self._sub_model_name(model_name, key, singular=True)
+                # Process each object in the array and merge its structure (once per distinct shape)
+                seen_shapes = set()
                 for element in value:
                     if isinstance(element, dict):
+                        shape = self.fingerprint(element)
+                        if shape in seen_shapes:
+                            continue
+                        seen_shapes.add(shape)
                         minimized_sub_obj = minimized_obj.get(key, [{}])
-                        self.parse_model(element, minimized_sub_obj[0], sub_model_name)
+                        self.parse_model(element, minimized_sub_obj[0], sub_model_name, f"{value_path}[*]")
                 current_type = f"array<{sub_model_name}>"
             else:
                 current_type = detected_type
@@ -108,12 +225,506 @@ class JSONParser:
         return self.models
 
 
-def parse_json_structures(full_json_string: str, minimized_json_string: str) -> tuple:
+class _ObjectFrame:
+    """
+    JSON object being streamed: target model (None if the object is not parsed into a model),
+    its minimized counterpart and the key whose value is being read.
+    """
+
+    def __init__(self, model_name, minimized_obj, recording: bool):
+        self.model_name = model_name
+        self.minimized_obj = minimized_obj
+        self.recording = recording
+        self.key = None
+        self.is_nullable = None
+
+
+class _ArrayFrame:
+    """
+    JSON array being streamed: detected element types and the state of its object elements parsing.
+    """
+
+    def __init__(self, owner: _ObjectFrame, minimized_list, recording: bool):
+        self.owner = owner
+        self.key = owner.key if owner else None
+        self.minimized_list = minimized_list
+        self.recording = recording
+        self.eligible = owner is not None and owner.model_name is not None
+        self.is_nullable = None
+        self.speculating = False
+        self.sub_model_name = None
+        self.detected_types = set()
+        self.count = 0
+        self.error = None
+
+
+class StreamingJSONParser(JSONParser):
+    """
+    Event-driven variant of the parser: consumes events from `iter_events` and merges properties
+    as soon as values are read, so the full Python object tree is never built.
+
+    Whether an array is `array<object>` is only known at its end, so its object elements are merged
+    speculatively: the first change of every touched property is journaled and restored
+    if a non-object element shows up.
+    """
+
+    def __init__(self, config: Config = None):
+        super().__init__(config)
+        self._journal = []
+
+    def _add_model(self, model_name: str):
+        """Create an empty model if it doesn't exist yet."""
+        if model_name not in self.models:
+            if self._journal:
+                self._journal[-1].setdefault((model_name, None), None)
+            self.models[model_name] = {}
+
+    def _merge_property(self, model_name: str, key: str, new_type: str, is_nullable: bool):
+        """Journal the original property state during speculation, then merge as usual."""
+        if self._journal and (model_name, key) not in self._journal[-1]:
+            existing = self.models[model_name].get(key)
+            self._journal[-1][(model_name, key)] = None if existing is None else existing.copy()
+        super()._merge_property(model_name, key, new_type, is_nullable)
+
+    def _commit(self):
+        """Accept speculative changes (keeping the outer speculation able to restore them)."""
+        saved = self._journal.pop()
+        if self._journal:
+            for entry, original in saved.items():
+                self._journal[-1].setdefault(entry, original)
+
+    def _rollback(self):
+        """Restore models to the state before the speculation started."""
+        saved = self._journal.pop()
+        for (model_name, key), original in reversed(saved.items()):
+            if key is None:
+                del self.models[model_name]
+            elif original is None:
+                del self.models[model_name][key]
+            else:
+                self.models[model_name][key] = original
+
+    def parse_events(self, events, minimized_obj=None, model_name: str = "RootModel") -> dict:
+        """
+        Parse a stream of JSON events and update the model data.
+        Without minimized object the streamed document acts as its own minimized version
+        (as `parse_json_structures` does): the first array elements are recorded for that.
+        """
+        stack = []
+
+        for event, value in events:
+            depth = len(stack)
+            try:
+                self._handle_event(stack, event, value, minimized_obj, model_name)
+            except Exception as e:
+                if not self._journal:
+                    raise
+                # Keep the frames balanced if the failed event opened a container
+                if event == "start_map" and len(stack) == depth:
+                    stack.append(_ObjectFrame(None, None, False))
+                elif event == "start_array" and len(stack) == depth:
+                    stack.append(_ArrayFrame(None, None, False))
+                self._defer_error(stack, e)
+
+        return self.models
+
+    def _handle_event(self, stack: list, event: str, value, minimized_obj, model_name: str):
+        """Apply a single JSON event to the frames stack."""
+        parent = stack[-1] if stack else None
+
+        if event == "map_key":
+            parent.key = value
+        elif event == "start_map":
+            stack.append(self._start_object(parent, minimized_obj, model_name))
+        elif event == "start_array":
+            stack.append(self._start_array(parent))
+        elif event == "end_map":
+            frame = stack.pop()
+            self._complete(stack[-1] if stack else None, "object", frame.model_name, False, frame.is_nullable)
+        elif event == "end_array":
+            frame = stack.pop()
+            detected_type = f"array<{next(iter(frame.detected_types))}>" \
+                if len(frame.detected_types) == 1 else "array<mixed>"
+            current_type = detected_type
+            if frame.error is not None and detected_type == "array<object>":
+                raise frame.error
+            if frame.speculating:
+                self._commit()
+                current_type = f"array<{frame.sub_model_name}>"
+            self._complete(stack[-1] if stack else None, detected_type, current_type, False, frame.is_nullable)
+        else:
+            if parent is None:
+                raise AttributeError("Root JSON value must be an object.")
+            if parent.recording:
+                self._record(parent, value)
+            detected_type = self.detect_type(value) if value is not None else None
+            self._complete(parent, detected_type, detected_type, value is None)
+
+    def _defer_error(self, stack: list, error: Exception):
+        """
+        Postpone an error raised while merging speculatively: it only counts
+        if the innermost speculating array turns out to be an array of objects.
+        """
+        index = max(i for i, frame in enumerate(stack) if isinstance(frame, _ArrayFrame) and frame.speculating)
+        array_frame = stack[index]
+        self._rollback()
+        array_frame.speculating = False
+        array_frame.eligible = False
+        array_frame.error = error
+        # Nothing inside the failed element is parsed anymore
+        for frame in stack[index + 1:]:
+            if isinstance(frame, _ObjectFrame):
+                frame.model_name = None
+            else:
+                frame.eligible = False
+
+    def _record(self, parent, skeleton):
+        """Store the skeleton of a value into the recorded minimized object."""
+        if isinstance(parent, _ObjectFrame):
+            parent.minimized_obj[parent.key] = skeleton
+        elif parent.count == 0:
+            parent.minimized_list.append(skeleton)
+
+    def _start_object(self, parent, minimized_obj, model_name: str) -> _ObjectFrame:
+        """Open an object frame, resolving its model and minimized object from the parent."""
+        if parent is None:
+            recording = minimized_obj is None
+            frame = _ObjectFrame(model_name, {} if recording else minimized_obj, recording)
+        elif isinstance(parent, _ObjectFrame):
+            is_nullable = self._is_nullable(parent)
+            if parent.recording:
+                frame = _ObjectFrame(None, {}, True)
+                self._record(parent, frame.minimized_obj)
+            else:
+                frame = _ObjectFrame(None, parent.minimized_obj.get(parent.key, {})
+                                     if parent.model_name is not None else None, False)
+            if parent.model_name is not None:
+                frame.model_name = self._sub_model_name(parent.model_name, parent.key)
+                frame.is_nullable = is_nullable
+        else:
+            recording = parent.recording and parent.count == 0
+            frame = _ObjectFrame(None, {} if recording else None, recording)
+            if recording:
+                self._record(parent, frame.minimized_obj)
+            if parent.eligible and parent.detected_types <= {"object"}:
+                if not parent.speculating:
+                    parent.sub_model_name = self._sub_model_name(parent.owner.model_name, parent.key, singular=True)
+                    parent.speculating = True
+                    self._journal.append({})
+                if not recording:
+                    minimized_list = parent.minimized_list if parent.recording \
+                        else parent.owner.minimized_obj.get(parent.key, [{}])
+                    frame.minimized_obj = minimized_list[0]
+                frame.model_name = parent.sub_model_name
+
+        if frame.model_name is not None:
+            self._add_model(frame.model_name)
+        return frame
+
+    def _start_array(self, parent) -> _ArrayFrame:
+        """Open an array frame."""
+        if parent is None:
+            raise AttributeError("Root JSON value must be an object.")
+        recording = parent.recording and (isinstance(parent, _ObjectFrame) or parent.count == 0)
+        frame = _ArrayFrame(parent if isinstance(parent, _ObjectFrame) else None, [] if recording else None, recording)
+        if frame.eligible:
+            frame.is_nullable = self._is_nullable(parent)
+        if recording:
+            self._record(parent, frame.minimized_list)
+        return frame
+
+    @staticmethod
+    def _is_nullable(parent: _ObjectFrame):
+        """Mark nullable if the key is not in minimized JSON (recorded keys are always there)."""
+        if parent.model_name is None:
+            return None
+        return False if parent.recording else parent.key not in parent.minimized_obj
+
+    def _complete(self, parent, detected_type, current_type, is_none: bool, is_nullable=None):
+        """Pass a completed value to its parent: merge it into the model or count it as an array element."""
+        if parent is None:
+            return
+
+        if isinstance(parent, _ArrayFrame):
+            if not is_none:
+                parent.detected_types.add(detected_type)
+                if detected_type != "object" and parent.speculating:
+                    self._rollback()
+                    parent.speculating = False
+                if detected_type != "object":
+                    parent.eligible = False
+            parent.count += 1
+            return
+
+        if parent.model_name is None:
+            return
+
+        model_name, key = parent.model_name, parent.key
+        if is_none:
+            # If no value and the model exists, update nullable status
+            self._merge_null(model_name, key)
+        else:
+            if is_nullable is None:
+                is_nullable = self._is_nullable(parent)
+            self._merge_property(model_name, key, current_type, is_nullable)
+
+
+class _ObjectTask:
+    """
+    Object being parsed by the iterative parser: its remaining items, target model,
+    minimized counterpart, the property merged into the parent model once it's done
+    and the weight (number of equal objects it stands for).
+    """
+
+    def __init__(self, obj: dict, minimized_obj, model_name: str, path, merge=None, weight: int = 1):
+        self.items = iter(obj.items())
+        self.minimized_obj = minimized_obj
+        self.model_name = model_name
+        self.path = path
+        self.merge = merge
+        self.weight = weight
+
+
+class _ElementsTask:
+    """
+    Array of objects being parsed by the iterative parser: its remaining distinct elements (with their counts),
+    their model and the `array<Model>` property merged into the parent model once it's done.
+    """
+
+    def __init__(self, elements, minimized_obj, model_name: str, path, merge, weight: int = 1):
+        self.elements = iter(elements)
+        self.minimized_obj = minimized_obj
+        self.model_name = model_name
+        self.path = path
+        self.merge = merge
+        self.weight = weight
+
+
+class IterativeJSONParser(JSONParser):
+    """
+    Explicit-stack variant of the parser producing the same models as `JSONParser`
+    without the recursion depth limit. Arrays (of arrays) are classified in a single pass over their elements,
+    which also groups the object elements by shape, so each distinct shape is then parsed once.
+    The work is limited by the budget if it's given (see `Budget`).
+    """
+
+    def __init__(self, config: Config = None, sampling: ArraySampling = None, budget: Budget = None):
+        super().__init__(config, sampling)
+        self.budget = budget
+        self._shapes = {}
+        self._interned = {}
+        self._keys = 0
+        # Nesting depth of the object being parsed
+        self._depth = 0
+
+    @staticmethod
+    def detect_type(value, sampling: ArraySampling = None, path: str = "$", budget: Budget = None,  # noqa: C901
+                    depth: int = 0) -> str:
+        """
+        Detect the data type, classifying nested arrays with an explicit stack (innermost first).
+        `depth` is the nesting depth of the object having the value (for the budget).
+        """
+        if not isinstance(value, list):
+            return JSONParser.detect_type(value)
+
+        def open_array(values, array_path):
+            if budget is not None:
+                budget.check_depth(depth + len(stack) + 1)
+                budget.check_array_length(values)
+            element_path = f"{array_path}[*]" if sampling else None
+            return iter(sampling.sample(values, array_path) if sampling else values), set(), element_path
+
+        stack = []
+        stack.append(open_array(value, path))
+        detected_type = None
+        while stack:
+            elements, detected_types, element_path = stack[-1]
+            if detected_type is not None:
+                # A nested array has just been classified
+                detected_types.add(detected_type)
+                detected_type = None
+
+            nested = None
+            if len(detected_types) < 2:
+                for v in elements:
+                    if isinstance(v, list):
+                        nested = v
+                        break
+                    if v is not None:
+                        detected_types.add(JSONParser.detect_type(v))
+                        if len(detected_types) > 1:
+                            break
+            if nested is not None:
+                stack.append(open_array(nested, element_path))
+                continue
+
+            # Stop as soon as the array is mixed
+            stack.pop()
+            detected_type = f"array<{next(iter(detected_types))}>" if len(detected_types) == 1 else "array<mixed>"
+
+        return detected_type
+
+    def _shape(self, value):
+        """Structural fingerprint of the value, built iteratively if it's nested beyond the recursion limit."""
+        memoized = self._shapes.get(id(value))
+        if memoized is not None:
+            return memoized[1]
+        try:
+            return self.fingerprint(value)
+        except RecursionError:
+            return self._deep_shape(value)
+
+    def _deep_shape(self, value):
+        """
+        Iterative `fingerprint`: structurally equal values get the same shape (a small number).
+        Shapes of nested containers are memoized for the current parsing.
+        """
+
+        def open_container(container, key):
+            items = iter(container.items()) if isinstance(container, dict) else ((None, item) for item in container)
+            return container, key, items, []
+
+        stack = [open_container(value, None)]
+        while True:
+            container, key, items, parts = stack[-1]
+            nested = None
+            for item_key, item in items:
+                if isinstance(item, (dict, list)):
+                    memoized = self._shapes.get(id(item))
+                    if memoized is None:
+                        nested = open_container(item, item_key)
+                        break
+                    item_shape = memoized[1]
+                else:
+                    item_shape = type(item)
+                parts.append((item_key, item_shape) if isinstance(container, dict) else item_shape)
+            if nested is not None:
+                stack.append(nested)
+                continue
+
+            stack.pop()
+            signature = (dict, tuple(parts)) if isinstance(container, dict) else (list, frozenset(parts))
+            container_shape = self._interned.setdefault(signature, len(self._interned))
+            # The container is kept referenced, so its id is not reused while memoized
+            self._shapes[id(container)] = (container, container_shape)
+            if not stack:
+                return container_shape
+            parent, _, _, parent_parts = stack[-1]
+            parent_parts.append((key, container_shape) if isinstance(parent, dict) else container_shape)
+
+    def _scan_array(self, values: list, path) -> tuple:
+        """
+        Classify the array and collect its distinct object elements in the same pass over the elements.
+        Returns the detected type and, for an array of objects, its elements once per distinct shape
+        with the number of elements of that shape (None otherwise). Arrays having anything but objects
+        (and nulls) are classified by `detect_type` from the first such element on.
+        """
+        elements = {}
+        counts = {}
+        for element in values:
+            if isinstance(element, dict):
+                shape = self._shape(element)
+                if shape in counts:
+                    counts[shape] += 1
+                else:
+                    elements[shape] = element
+                    counts[shape] = 1
+            elif element is not None:
+                return self.detect_type(values, self.sampling, path, self.budget, self._depth), None
+        if not counts:
+            # Empty or nulls only
+            return self.detect_type(values, self.sampling, path, self.budget, self._depth), None
+        return "array<object>", [(element, counts[shape]) for shape, element in elements.items()]
+
+    def _open_object(self, obj: dict, minimized_obj, model_name: str, path, merge=None, weight: int = 1) -> _ObjectTask:
+        """Create the task parsing the object into the model (`weight` is the number of equal objects)."""
+        if model_name not in self.models:
+            self.models[model_name] = {}
+            if self.budget is not None:
+                self.budget.check_models(len(self.models))
+        if self.budget is not None:
+            self._keys += len(obj)
+            self.budget.check_keys(self._keys)
+        return _ObjectTask(obj, minimized_obj, model_name, path, merge, weight)
+
+    def parse_model(self, obj, minimized_obj, model_name: str = "RootModel", path: str = "$") -> dict:
+        """Parse a given object and update the model data (nested objects are tasks on the stack)."""
+        if not isinstance(obj, dict):
+            # Before the keys are counted, the same error as the recursive parser gives (a JSON parsing error)
+            raise AttributeError(f"'{type(obj).__name__}' object has no attribute 'items'")
+        stack = [self._open_object(obj, minimized_obj, model_name, path if self.sampling else None)]
+        try:
+            while stack:
+                task = stack[-1]
+                if isinstance(task, _ObjectTask):
+                    self._depth = len(stack)
+                    nested = self._parse_items(task)
+                else:
+                    element, count = next(task.elements, (None, 0))
+                    nested = None if element is None else self._open_object(
+                        element, task.minimized_obj, task.model_name, task.path, weight=task.weight * count)
+                if nested is not None:
+                    stack.append(nested)
+                    if self.budget is not None:
+                        self.budget.check_depth(len(stack))
+                    continue
+
+                stack.pop()
+                if task.merge is not None:
+                    self._merge_property(*task.merge)
+        finally:
+            self._shapes.clear()
+
+        return self.models
+
+    def _parse_items(self, task: _ObjectTask):
+        """Merge properties of the object until a nested object or array of objects is found (returned as a task)."""
+        model_name, minimized_obj = task.model_name, task.minimized_obj
+        for key, value in task.items:
+            # If no value, update nullable status
+            if value is None:
+                self._merge_null(model_name, key)
+                continue
+
+            value_path = f"{task.path}.{key}" if self.sampling else None
+            if isinstance(value, list) and self.budget is not None:
+                # The whole array counts, even if it's sampled
+                self.budget.check_array_length(value)
+            if isinstance(value, list) and self.sampling:
+                # Sample once, so the same elements are used for type detection and merging
+                value = self.sampling.sample(value, value_path)
+
+            distinct_objects = None
+            if isinstance(value, list):
+                detected_type, distinct_objects = self._scan_array(value, value_path)
+            else:
+                detected_type = self.detect_type(value)
+            is_nullable = key not in minimized_obj  # Mark nullable if the key is not in minimized JSON
+
+            if detected_type == "object" and isinstance(value, dict):
+                sub_model_name = self._sub_model_name(model_name, key)
+                return self._open_object(value, minimized_obj.get(key, {}), sub_model_name, value_path,
+                                         (model_name, key, sub_model_name, is_nullable), task.weight)
+            elif distinct_objects:
+                sub_model_name = self._sub_model_name(model_name, key, singular=True)
+                return _ElementsTask(distinct_objects, minimized_obj.get(key, [{}])[0], sub_model_name,
+                                     f"{value_path}[*]" if self.sampling else None,
+                                     (model_name, key, f"array<{sub_model_name}>", is_nullable), task.weight)
+
+            self._merge_property(model_name, key, detected_type, is_nullable)
+
+        return None
+
+
+def parse_json_structures(full_json_string: str, minimized_json_string: str, config: Config = None,
+                          sampling: ArraySampling = None, budget: Budget = None) -> tuple:
     """
     Main function to parse and merge two JSON versions into a single model.
+    Long arrays are only sampled if sampling is given (see its report for the coverage).
+    The nesting depth is not limited (see `IterativeJSONParser`) unless the budget limits it (see `Budget`).
     Returns dictionary and error message in case error.
     """
-    parser = JSONParser()
+    parser = IterativeJSONParser(config, sampling, budget)
 
     # Do nothing if main JSON is empty
     if full_json_string.split() == '':
@@ -123,9 +734,14 @@ def parse_json_structures(full_json_string: str, minimized_json_string: str) ->
     minimized_json_string = full_json_string if minimized_json_string.strip() == '' else minimized_json_string
 
     try:
+        if budget is not None:
+            # Before the texts are loaded
+            budget.check_bytes(full_json_string)
+            budget.check_bytes(minimized_json_string)
+
         # Load the full and minimized JSON
-        full_json = json.loads(full_json_string)
-        minimized_json = json.loads(minimized_json_string)
+        full_json = loads(full_json_string)
+        minimized_json = loads(minimized_json_string)
 
         # Merge both structures into a single model data (dictionary)
         merged_models_dict = parser.parse_model(full_json, minimized_json)
@@ -135,3 +751,41 @@ def parse_json_structures(full_json_string: str, minimized_json_string: str) ->
         return dict(), "Error: JSON parsing error"
     except ValueError as e:
         return dict(), f"Error: {e}"
+
+
+def parse_json_values(full_json, minimized_json=None, config: Config = None, budget: Budget = None) -> tuple:
+    """
+    `parse_json_structures` for JSON values that are already decoded (e.g. parts of a JSON API request),
+    the minimized value is optional (None). The size of decoded values is not checked.
+    Returns dictionary and error message in case error.
+    """
+    parser = IterativeJSONParser(config, budget=budget)
+
+    try:
+        return parser.parse_model(full_json, full_json if minimized_json is None else minimized_json), None
+    except AttributeError:
+        return dict(), "Error: JSON parsing error"
+    except ValueError as e:
+        return dict(), f"Error: {e}"
+
+
+def parse_json_stream(full_json_source, minimized_json_string: str = "", config: Config = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple:
+    """
+    Streaming version of `parse_json_structures` for large documents.
+    The full JSON may be a string, a file-like object or an iterable of chunks and is read incrementally.
+    Returns dictionary and error message in case error.
+    """
+    parser = StreamingJSONParser(config)
+
+    try:
+        # Minimized JSON is small and optional, the full one acts as minimized if it's empty
+        minimized_json = loads(minimized_json_string) if minimized_json_string.strip() != '' else None
+
+        merged_models_dict = parser.parse_events(iter_events(full_json_source, chunk_size), minimized_json)
+
+        return merged_models_dict, None
+    except (json.JSONDecodeError, AttributeError):
+        return dict(), "Error: JSON parsing error"
+    except ValueError as e:
+        return dict(), f"Error: {e}"
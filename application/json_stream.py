@@ -0,0 +1,244 @@
+import codecs
+import json
+import re
+from json.decoder import scanstring
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+NUMBER_RE = re.compile(r'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?')
+WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+CONSTANTS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# Parser states
+VALUE, VALUE_OR_END, KEY, KEY_OR_END, COLON, COMMA_OR_END, DONE = range(7)
+
+
+def iter_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield text chunks from a string, a file-like object (text or binary) or an iterable of chunks.
+    """
+    if isinstance(source, (str, bytes)):
+        text = source
+        source = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    elif hasattr(source, "read"):
+        stream = source
+        source = iter(lambda: stream.read(chunk_size), stream.read(0))
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in source:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    yield decoder.decode(b"", final=True)
+
+
+class _Reader:
+    """
+    Sliding text buffer over the input chunks.
+    """
+
+    def __init__(self, source, chunk_size: int):
+        self.chunks = iter_chunks(source, chunk_size)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text. Returns False at the end of input."""
+        for chunk in self.chunks:
+            if chunk:
+                self.buf = self.buf[self.pos:] + chunk
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def error(self, message: str):
+        return json.JSONDecodeError(message, self.buf, self.pos)
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character without consuming it ('' at the end of input)."""
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def ensure(self, size: int) -> bool:
+        """Make sure at least `size` characters are buffered after the current position."""
+        while len(self.buf) - self.pos < size:
+            if not self.fill():
+                return False
+        return True
+
+    def read_string(self) -> str:
+        """Read a quoted string starting at the current position."""
+        search_from = self.pos + 1
+        while True:
+            end = self.buf.find('"', search_from)
+            if end == -1:
+                search_from = len(self.buf) - self.pos
+                if not self.fill():
+                    raise self.error("Unterminated string starting at")
+                continue
+            # Skip quotes escaped with an odd number of backslashes
+            backslash = end - 1
+            while self.buf[backslash] == "\\":
+                backslash -= 1
+            if (end - 1 - backslash) % 2:
+                search_from = end + 1
+                continue
+            value, self.pos = scanstring(self.buf, self.pos + 1, True)
+            return value
+
+    def read_number(self):
+        """Read a number (or one of the non-standard constants accepted by `json.loads`)."""
+        while True:
+            match = NUMBER_RE.match(self.buf, self.pos)
+            end = match.end() if match else self.pos
+            # A number may continue in the next chunk ("1" + ".5", "1e" + "-3")
+            if self.eof or len(self.buf) - end > 2:
+                break
+            self.fill()
+
+        if match is None:
+            return self.read_constant()
+
+        number, fraction, exponent = match.group(0, 1, 2)
+        self.pos = match.end()
+        return float(number) if fraction or exponent else int(number)
+
+    def read_constant(self):
+        """Read `true`, `false`, `null` and the constants `NaN`, `Infinity`, `-Infinity`."""
+        for literal, value in CONSTANTS.items():
+            if self.buf[self.pos] == literal[0] and self.ensure(len(literal)) \
+                    and self.buf.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return value
+        raise self.error("Expecting value")
+
+
+def iter_events(source, chunk_size: int = DEFAULT_CHUNK_SIZE):  # noqa: C901
+    """
+    Incrementally parse JSON and yield `(event, value)` pairs without building the object tree.
+    Events: start_map, map_key, end_map, start_array, end_array and value (for scalars).
+    """
+    reader = _Reader(source, chunk_size)
+    containers = []
+    state = VALUE
+
+    while True:
+        char = reader.next_char()
+
+        if state == DONE:
+            if char:
+                raise reader.error("Extra data")
+            return
+
+        if char == "":
+            raise reader.error("Expecting value" if state in (VALUE, VALUE_OR_END) else "Unexpected end of data")
+
+        if state in (VALUE, VALUE_OR_END):
+            if char == "]" and state == VALUE_OR_END:
+                reader.pos += 1
+                containers.pop()
+                yield "end_array", None
+            elif char == "{":
+                reader.pos += 1
+                containers.append("{")
+                yield "start_map", None
+                state = KEY_OR_END
+                continue
+            elif char == "[":
+                reader.pos += 1
+                containers.append("[")
+                yield "start_array", None
+                state = VALUE_OR_END
+                continue
+            elif char == '"':
+                yield "value", reader.read_string()
+            elif char in "-0123456789":
+                yield "value", reader.read_number()
+            else:
+                yield "value", reader.read_constant()
+        elif state in (KEY, KEY_OR_END):
+            if char == "}" and state == KEY_OR_END:
+                reader.pos += 1
+                containers.pop()
+                yield "end_map", None
+            elif char == '"':
+                yield "map_key", reader.read_string()
+                state = COLON
+                continue
+            else:
+                raise reader.error("Expecting property name enclosed in double quotes")
+        elif state == COLON:
+            if char != ":":
+                raise reader.error("Expecting ':' delimiter")
+            reader.pos += 1
+            state = VALUE
+            continue
+        elif state == COMMA_OR_END:
+            if char == ",":
+                reader.pos += 1
+                state = KEY if containers[-1] == "{" else VALUE
+                continue
+            if char != ("}" if containers[-1] == "{" else "]"):
+                raise reader.error("Expecting ',' delimiter")
+            reader.pos += 1
+            yield ("end_map" if containers.pop() == "{" else "end_array"), None
+
+        # A value has been completed
+        state = COMMA_OR_END if containers else DONE
+
+
+def build_value(events):
+    """Build the Python value from `(event, value)` pairs with an explicit stack (no nesting limit)."""
+    root = None
+    containers = []
+    key = None
+
+    for event, value in events:
+        if event == "map_key":
+            key = value
+            continue
+        if event in ("end_map", "end_array"):
+            containers.pop()
+            continue
+
+        if event == "start_map":
+            value = {}
+        elif event == "start_array":
+            value = []
+
+        # Containers are attached to their parent when opened, while the key is still known
+        if not containers:
+            root = value
+        elif isinstance(containers[-1], dict):
+            containers[-1][key] = value
+        else:
+            containers[-1].append(value)
+
+        if event != "value":
+            containers.append(value)
+
+    return root
+
+
+def loads(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    `json.loads` without its nesting depth limit: documents nested too deeply for it
+    (and file-like objects or chunk iterables) are built from `iter_events`.
+    """
+    if isinstance(source, (str, bytes)):
+        try:
+            return json.loads(source)
+        except RecursionError:
+            pass
+    return build_value(iter_events(source, chunk_size))
@@ -0,0 +1,56 @@
+import sys
+
+
+class Property:
+    """
+    Model property: base type (str), nullable (bool) and possible types.
+    Type strings are interned and a single possible type is kept as a string instead of a set.
+    Unpacks and compares like the tuple (type, nullable, set of types).
+    """
+
+    __slots__ = ("type", "nullable", "_types")
+
+    def __init__(self, prop_type: str, nullable: bool, types=None):
+        self.type = sys.intern(prop_type)
+        self.nullable = nullable
+        if types is None:
+            self._types = self.type
+        elif isinstance(types, str):
+            self._types = sys.intern(types)
+        elif len(types) == 1:
+            self._types = sys.intern(next(iter(types)))
+        else:
+            self._types = frozenset(sys.intern(t) for t in types)
+
+    @property
+    def types(self) -> frozenset:
+        """Set of possible types."""
+        return frozenset((self._types,)) if isinstance(self._types, str) else self._types
+
+    @property
+    def has_multiple_types(self) -> bool:
+        return not isinstance(self._types, str)
+
+    def add_type(self, prop_type: str):
+        """Add a possible type."""
+        if isinstance(self._types, str):
+            if prop_type != self._types:
+                self._types = frozenset((self._types, sys.intern(prop_type)))
+        elif prop_type not in self._types:
+            self._types = self._types | {sys.intern(prop_type)}
+
+    def copy(self) -> "Property":
+        return Property(self.type, self.nullable, self._types)
+
+    def __iter__(self):
+        return iter((self.type, self.nullable, self.types))
+
+    def __eq__(self, other):
+        if isinstance(other, (Property, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Property({self.type!r}, {self.nullable!r}, {set(self.types)!r})"
@@ -0,0 +1,174 @@
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from application.config import Config
+from application.json_parser import IterativeJSONParser, JSONParser
+from application.json_stream import loads
+
+DEFAULT_SAMPLES_PER_CHUNK = 1000
+
+
+class PartialModel:
+    """
+    Models inferred from a part of the samples, mergeable with the other parts:
+        models => as `JSONParser.models` (nullable only if a null value was seen)
+        objects => model name => number of objects parsed into the model
+        presence => model name => key => number of those objects having the key
+        nulls => model name => keys having a null value (their type may be known from the other parts only)
+    """
+
+    def __init__(self):
+        self.models = {}
+        self.objects = {}
+        self.presence = {}
+        self.nulls = {}
+
+    def merge(self, other: "PartialModel") -> "PartialModel":
+        """
+        Merge the other partial model into this one (and return it). The merge is associative,
+        so parts can be inferred in parallel and merged in their order with the same result.
+        """
+        merger = JSONParser()
+        merger.models = self.models
+        for model_name, properties in other.models.items():
+            model = self.models.setdefault(model_name, {})
+            for key, prop in properties.items():
+                if key not in model:
+                    model[key] = prop.copy()
+                    continue
+                # The main type goes first, as if the values were parsed one after another
+                for prop_type in sorted(prop.types, key=lambda t: (t != prop.type, t)):
+                    merger._merge_property(model_name, key, prop_type, prop.nullable)
+
+        for model_name, count in other.objects.items():
+            self.objects[model_name] = self.objects.get(model_name, 0) + count
+        for model_name, counts in other.presence.items():
+            presence = self.presence.setdefault(model_name, {})
+            for key, count in counts.items():
+                presence[key] = presence.get(key, 0) + count
+        for model_name, keys in other.nulls.items():
+            self.nulls.setdefault(model_name, set()).update(keys)
+
+        return self
+
+    def to_models(self) -> dict:
+        """Final models: keys missing in some objects of the model (or having a null value) are nullable."""
+        models = {}
+        for model_name, properties in self.models.items():
+            objects = self.objects.get(model_name, 0)
+            presence = self.presence.get(model_name, {})
+            nulls = self.nulls.get(model_name, set())
+            if not nulls <= properties.keys():
+                # Only null values of the key in all the samples
+                JSONParser.detect_type(None)
+            models[model_name] = {}
+            for key, prop in properties.items():
+                prop = prop.copy()
+                prop.nullable = prop.nullable or key in nulls or presence.get(key, 0) < objects
+                models[model_name][key] = prop
+        return models
+
+
+class _AllKeys:
+    """Minimized counterpart having every key (at any depth), so no property is nullable because of it."""
+
+    def __contains__(self, key):
+        return True
+
+    def get(self, key, default=None):
+        return self
+
+    def __getitem__(self, index):
+        return self
+
+
+ALL_KEYS = _AllKeys()
+
+
+class SampleParser(IterativeJSONParser):
+    """
+    Parser counting the objects of every model and the keys present in them.
+    Equal array elements are parsed once, but counted as many times as they occur.
+    """
+
+    def __init__(self, config: Config = None):
+        super().__init__(config)
+        self.partial = PartialModel()
+        self.partial.models = self.models
+
+    def _open_object(self, obj: dict, minimized_obj, model_name: str, path, merge=None, weight: int = 1):
+        objects = self.partial.objects
+        objects[model_name] = objects.get(model_name, 0) + weight
+        presence = self.partial.presence.setdefault(model_name, {})
+        for key in obj:
+            presence[key] = presence.get(key, 0) + weight
+        return super()._open_object(obj, minimized_obj, model_name, path, merge, weight)
+
+    def _merge_null(self, model_name: str, key: str):
+        # The type of the key may come from the other samples (see `PartialModel.to_models`)
+        self.partial.nulls.setdefault(model_name, set()).add(key)
+
+    def parse_sample(self, obj: dict) -> dict:
+        """Parse a sample (nullable are the null values only, the rest comes from the presence counts)."""
+        return self.parse_model(obj, ALL_KEYS)
+
+
+def iter_samples(source):
+    """Yield `(line number, JSON text)` of the non-empty lines of NDJSON text (or an iterable of lines)."""
+    lines = source.splitlines() if isinstance(source, str) else source
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def parse_samples(samples, config: Config = None) -> PartialModel:
+    """
+    Infer the partial model from `(line number, JSON text)` samples.
+    Runs in a worker process. Errors are raised as ValueError with the line number.
+    """
+    parser = SampleParser(config)
+    for line_number, text in samples:
+        try:
+            parser.parse_sample(loads(text))
+        except (json.JSONDecodeError, AttributeError):
+            raise ValueError(f"JSON parsing error on line {line_number}") from None
+        except ValueError as e:
+            raise ValueError(f"{e} (line {line_number})") from None
+
+    return parser.partial
+
+
+def parse_ndjson(source, config: Config = None, jobs: int = 1,
+                 samples_per_chunk: int = DEFAULT_SAMPLES_PER_CHUNK) -> tuple:
+    """
+    Infer models from many samples (NDJSON: one JSON object per line).
+    Chunks of samples are read lazily, parsed in `jobs` worker processes and their partial models merged
+    in order as they finish, so only the chunks in flight are kept in memory.
+    Returns dictionary and error message in case error.
+    """
+    samples = iter_samples(source)
+    chunks = iter(lambda: list(islice(samples, samples_per_chunk)), [])
+    partial = PartialModel()
+
+    try:
+        first = next(chunks, [])
+        second = next(chunks, None) if jobs > 1 else None
+        if second is None:
+            partial.merge(parse_samples(first, config))
+            for chunk in chunks:
+                partial.merge(parse_samples(chunk, config))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                # At most two chunks per worker are read ahead, every chunk is dropped once it's merged
+                pending = deque(executor.submit(parse_samples, chunk, config) for chunk in (first, second))
+                del first, second
+                for chunk in chunks:
+                    if len(pending) >= 2 * jobs:
+                        partial.merge(pending.popleft().result())
+                    pending.append(executor.submit(parse_samples, chunk, config))
+                while pending:
+                    partial.merge(pending.popleft().result())
+        return partial.to_models(), None
+    except ValueError as e:
+        return dict(), f"Error: {e}"
@@ -0,0 +1,106 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# Type expression kinds
+SCALAR, MODEL, ARRAY, UNION = "scalar", "model", "array", "union"
+
+BASE_TYPES = frozenset(("int", "float", "bool", "string"))
+SCALAR_TYPES = BASE_TYPES | {"object", "mixed"}
+
+# Per-language mapping of scalar types
+PHP_TYPES = {"int": "int", "float": "float", "bool": "bool", "string": "string", "object": "object", "mixed": "mixed"}
+JAVA_TYPES = {"int": "int", "float": "double", "bool": "boolean", "string": "String", "object": "Object",
+              "mixed": "mixed"}
+PYTHON_TYPES = {"int": "int", "float": "float", "bool": "bool", "string": "str", "object": "dict", "mixed": "Any"}
+
+
+class TypeExpr(namedtuple("TypeExpr", ("kind", "value"))):
+    """
+    Parsed (hashable) type:
+        SCALAR => value is the scalar type name (base types, object or mixed)
+        MODEL => value is the model name
+        ARRAY => value is the item type expression
+        UNION => value is frozenset of type expressions
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_base(self) -> bool:
+        return self.kind == SCALAR and self.value in BASE_TYPES
+
+    @property
+    def is_model(self) -> bool:
+        return self.kind == MODEL
+
+    @property
+    def is_array(self) -> bool:
+        return self.kind == ARRAY
+
+    @property
+    def is_union(self) -> bool:
+        return self.kind == UNION
+
+    def __str__(self):
+        if self.kind == ARRAY:
+            return f"array<{self.value}>"
+        if self.kind == UNION:
+            return "mixed"
+        return self.value
+
+
+@lru_cache(maxsize=16384)
+def parse_type(type_str: str) -> TypeExpr:
+    """Parse an internal type string (e.g. `array<array<int>>`) to the type expression."""
+    if type_str.startswith("array<") and type_str.endswith(">"):
+        return TypeExpr(ARRAY, parse_type(type_str[6:-1]))
+    if type_str in SCALAR_TYPES:
+        return TypeExpr(SCALAR, type_str)
+    return TypeExpr(MODEL, type_str)
+
+
+@lru_cache(maxsize=4096)
+def union_type(types: frozenset) -> TypeExpr:
+    """Type expression for the set of possible types."""
+    return TypeExpr(UNION, frozenset(parse_type(t) for t in types))
+
+
+def property_type(prop_type: str, prop_types) -> TypeExpr:
+    """Type expression of a model property ('mixed' is the union of its possible types)."""
+    return parse_type(prop_type) if prop_type != "mixed" else union_type(frozenset(prop_types))
+
+
+@lru_cache(maxsize=16384)
+def to_php_type(expr: TypeExpr) -> str:
+    """Map type expression to PHP type."""
+    if expr.kind == SCALAR:
+        return PHP_TYPES[expr.value]
+    if expr.kind == ARRAY:
+        return "array"
+    if expr.kind == UNION:
+        return "|".join(sorted(to_php_type(member) for member in expr.value))
+    return expr.value
+
+
+@lru_cache(maxsize=16384)
+def to_java_type(expr: TypeExpr) -> str:
+    """Map type expression to Java type."""
+    if expr.kind == SCALAR:
+        return JAVA_TYPES[expr.value]
+    if expr.kind == ARRAY:
+        return f"ArrayList<{to_java_type(expr.value)}>"
+    if expr.kind == UNION:
+        return "|".join(sorted(to_java_type(member) for member in expr.value))
+    return expr.value
+
+
+@lru_cache(maxsize=16384)
+def to_python_type(expr: TypeExpr) -> str:
+    """Map type expression to Python type hint (arrays of base types are plain lists)."""
+    if expr.kind == SCALAR:
+        return PYTHON_TYPES[expr.value]
+    if expr.kind == ARRAY:
+        return "list" if expr.value.is_base else f"List[{to_python_type(expr.value)}]"
+    if expr.kind == UNION:
+        return "Any"
+    return expr.value
@@ -0,0 +1,215 @@
+import json
+from collections import namedtuple
+from application.type_expr import ARRAY, MODEL, SCALAR, UNION, TypeExpr, property_type, union_type
+
+NoneType = type(None)
+
+# Python types of JSON values allowed by the scalar types (JSON doesn't tell 1.0 from 1, so floats accept integers)
+SCALAR_PYTHON_TYPES = {
+    "int": frozenset((int,)),
+    "float": frozenset((float, int)),
+    "bool": frozenset((bool,)),
+    "string": frozenset((str,)),
+    "object": frozenset((dict,)),
+}
+JSON_KINDS = {dict: "object", list: "array", str: "string", int: "int", float: "float", bool: "bool", NoneType: "null"}
+
+
+class Deviation(namedtuple("Deviation", ("path", "message"))):
+    """First place where a payload deviates from the model: JSON path (`$.orders[2].id`) and the reason."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+
+def _kind(value) -> str:
+    return JSON_KINDS.get(type(value), type(value).__name__)
+
+
+def _describe(expr: TypeExpr) -> str:
+    if expr.kind == UNION:
+        return " or ".join(sorted(_describe(member) for member in expr.value))
+    return str(expr)
+
+
+def _python_types(expr: TypeExpr):
+    """Python types of the values matching a scalar type expression (None if it's not scalar, or anything goes)."""
+    if expr.kind == SCALAR:
+        return SCALAR_PYTHON_TYPES.get(expr.value)
+    if expr.kind == UNION:
+        members = [_python_types(member) for member in expr.value]
+        return None if None in members else frozenset().union(*members)
+    return None
+
+
+class Validator:
+    """
+    Payload validator compiled from the models (see `parse_json_structures`): key sets, type checks
+    and validators of nested models are prepared once, so validating a payload only runs the specialized checks.
+    Keys missing in the model are deviations unless `allow_unknown_keys` is set.
+    """
+
+    def __init__(self, models: dict, model_name: str = "RootModel", allow_unknown_keys: bool = False):
+        self.models = models
+        self.allow_unknown_keys = allow_unknown_keys
+        self._slots = {}
+        self._check = self._compile_model(model_name)[0]
+
+    def validate(self, payload) -> Deviation:
+        """Return the first deviation of the payload from the model (None if it matches)."""
+        try:
+            error = self._check(payload)
+        except RecursionError:
+            return Deviation("$", "nesting too deep")
+        return None if error is None else Deviation("$" + error[0], error[1])
+
+    def validate_many(self, payloads):
+        """Yield the first deviation (or None) of every payload, reading them lazily."""
+        check = self._check
+        for payload in payloads:
+            try:
+                error = check(payload)
+            except RecursionError:
+                error = ("", "nesting too deep")
+            yield None if error is None else Deviation("$" + error[0], error[1])
+
+    def iter_deviations(self, samples):
+        """Yield `(line number, deviation)` of the deviating NDJSON samples (see `samples.iter_samples`)."""
+        validate = self.validate
+        for line_number, text in samples:
+            try:
+                deviation = validate(json.loads(text))
+            except ValueError:
+                deviation = Deviation("$", "JSON parsing error")
+            if deviation is not None:
+                yield line_number, deviation
+
+    def _compile_model(self, model_name: str) -> list:  # noqa: C901
+        """
+        Compile the model check into a slot (single item list). The slot is created before the properties
+        are compiled, so recursive models refer to it before their check is ready.
+        """
+        if model_name in self._slots:
+            return self._slots[model_name]
+        slot = self._slots[model_name] = [None]
+
+        properties = self.models.get(model_name, {})
+        known_keys = frozenset(properties)
+        allow_unknown_keys = self.allow_unknown_keys
+        # Scalar properties only need the type of the value (a missing key reads as null,
+        # so missing required keys fail the type checks too)
+        scalar_checks = []
+        nested_checks = []
+        for key, prop in properties.items():
+            # Every type seen for the key is accepted, not only the main one (`array<int>` + `array<string>`)
+            expr = union_type(frozenset(prop.types)) if len(prop.types) > 1 else property_type(prop.type, prop.types)
+            python_types = _python_types(expr)
+            if python_types is not None:
+                scalar_checks.append((key, python_types | {NoneType} if prop.nullable else python_types, expr))
+            elif expr.kind != SCALAR:
+                nested_checks.append((key, self._compile(expr), prop.nullable))
+        scalar_checks = tuple(scalar_checks)
+        nested_checks = tuple(nested_checks)
+
+        def check_model(value):
+            if type(value) is not dict:
+                return "", f"expected {model_name} but got {_kind(value)}"
+            if not allow_unknown_keys and not value.keys() <= known_keys:
+                key = next(key for key in value if key not in known_keys)
+                return f".{key}", "unknown key"
+
+            get = value.get
+            for key, python_types, expr in scalar_checks:
+                if type(get(key)) not in python_types:
+                    if key not in value:
+                        return f".{key}", "missing key"
+                    return f".{key}", f"expected {_describe(expr)} but got {_kind(get(key))}"
+            for key, check, nullable in nested_checks:
+                item = get(key)
+                if item is None:
+                    if nullable:
+                        continue
+                    if key not in value:
+                        return f".{key}", "missing key"
+                    return f".{key}", "expected a value but got null"
+                error = check(item)
+                if error is not None:
+                    return f".{key}{error[0]}", error[1]
+            return None
+
+        slot[0] = check_model
+        return slot
+
+    def _compile(self, expr: TypeExpr):
+        """Compile the check of a (non-null) value of the type: returns None or (relative path, message)."""
+        python_types = _python_types(expr)
+        if python_types is not None:
+            def check_scalar(value):
+                if type(value) not in python_types:
+                    return "", f"expected {_describe(expr)} but got {_kind(value)}"
+                return None
+            return check_scalar
+
+        if expr.kind == MODEL:
+            slot = self._compile_model(expr.value)
+            # A model being compiled (recursive reference) is looked up in its slot on every call
+            return slot[0] if slot[0] is not None else lambda value: slot[0](value)
+
+        if expr.kind == ARRAY:
+            return self._compile_array(expr)
+
+        if expr.kind == UNION:
+            member_checks = tuple(self._compile(member) for member in expr.value)
+
+            def check_union(value):
+                for check in member_checks:
+                    if check(value) is None:
+                        return None
+                return "", f"expected {_describe(expr)} but got {_kind(value)}"
+            return check_union
+
+        # 'mixed' (any value)
+        return lambda value: None
+
+    def _compile_array(self, expr: TypeExpr):  # noqa: C901
+        """Compile the check of an array (null elements are allowed, as they are skipped by the type detection)."""
+        item_types = _python_types(expr.value)
+        if item_types is not None:
+            item_types = item_types | {NoneType}
+
+            def check_scalar_array(value):
+                if type(value) is not list:
+                    return "", f"expected {expr} but got {_kind(value)}"
+                if item_types.issuperset(map(type, value)):
+                    return None
+                index = next(i for i, item in enumerate(value) if type(item) not in item_types)
+                return f"[{index}]", f"expected {_describe(expr.value)} but got {_kind(value[index])}"
+            return check_scalar_array
+
+        if expr.value.kind == SCALAR:
+            # array<mixed>
+            def check_any_array(value):
+                if type(value) is not list:
+                    return "", f"expected {expr} but got {_kind(value)}"
+                return None
+            return check_any_array
+
+        check_item = self._compile(expr.value)
+
+        def check_array(value):
+            if type(value) is not list:
+                return "", f"expected {expr} but got {_kind(value)}"
+            for index, item in enumerate(value):
+                if item is not None:
+                    error = check_item(item)
+                    if error is not None:
+                        return f"[{index}]{error[0]}", error[1]
+            return None
+        return check_array
+
+
+def compile_validator(models: dict, model_name: str = "RootModel", allow_unknown_keys: bool = False) -> Validator:
+    """Compile the models (as returned by `parse_json_structures`) into a payload validator."""
+    return Validator(models, model_name, allow_unknown_keys)
@@ -0,0 +1,322 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.payloads import build_payloads
+
+# python -m benchmarks.load --rate 50 --duration 30 -o load.json
+# python -m benchmarks.load --server processes --processes 8 --config CONVERSION_WORKERS=0
+
+DEFAULT_MIX = "page=2,convert=5,download=1"
+LANGUAGE_PAGES = ("php", "java", "python")
+SAMPLE_INTERVAL = 0.05
+# Conversion errors are shown on the page (status 200) in the error alert
+ERROR_MARKER = b'class="alert alert-danger"'
+
+
+def _serve(connection, config: dict, threaded: bool, processes: int):
+    """Server process: run the app on a free local port and send the port back."""
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    # No access log lines (the report is printed by the harness)
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, create_app(config), threaded=threaded, processes=processes)
+    connection.send(server.server_port)
+    connection.close()
+    server.serve_forever()
+
+
+def start_server(config: dict, threaded: bool = True, processes: int = 1) -> tuple:
+    """Start the app in a server process (threaded, or a forked process per request). Returns the process and URL."""
+    parent_connection, child_connection = multiprocessing.Pipe()
+    # Not a daemon, as the app starts its own worker processes (it's killed when the load is over)
+    process = multiprocessing.Process(target=_serve,
+                                      args=(child_connection, config, threaded, 1 if threaded else processes))
+    process.start()
+    child_connection.close()
+    try:
+        if not parent_connection.poll(60):
+            raise RuntimeError("Server didn't start in 60 seconds.")
+        port = parent_connection.recv()
+    except (EOFError, RuntimeError) as e:
+        process.kill()
+        process.join()
+        raise RuntimeError(str(e) or "Server failed to start.") from None
+    return process, f"http://127.0.0.1:{port}"
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident memory of the process and all its descendants in bytes (None without /proc)."""
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    rss = {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command may have spaces, fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21]) * page_size
+
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total
+
+
+class RSSSampler(threading.Thread):
+    """Sample the resident memory of the server process tree and keep its peak."""
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            rss = process_tree_rss(self.pid)
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def stop(self) -> int:
+        self._stopped.set()
+        self.join()
+        return self.peak
+
+
+def parse_mix(mix: str) -> dict:
+    """Parse the request mix `kind=weight,...` (kinds: page, convert, download): kind => weight."""
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("page", "convert", "download") or not weight.isdigit():
+            raise ValueError(f"Invalid request mix '{part}'.")
+        weights[kind] = int(weight)
+    if not any(weights.values()):
+        raise ValueError("Request mix has no requests.")
+    return weights
+
+
+def build_requests(weights: dict, payloads: dict, unique: bool = True):
+    """
+    Yield `(kind, path, form data or None)` of the requests in a fixed mix order (weighted round robin).
+    Conversions go through the languages and payloads, `unique` payloads miss the result cache.
+    """
+    kinds = [kind for kind, weight in weights.items() for _ in range(weight)]
+    payload_texts = list(payloads.values())
+    number = 0
+    while True:
+        for kind in kinds:
+            language = LANGUAGE_PAGES[number % len(LANGUAGE_PAGES)]
+            if kind == "page":
+                yield kind, f"/{language}", None
+            else:
+                payload = payload_texts[number % len(payload_texts)]
+                if unique:
+                    payload = dict(payload, loadRequest=number)
+                data = {"json_full": json.dumps(payload), "json_min": ""}
+                if kind == "download":
+                    data["action"] = "download"
+                yield kind, f"/{language}", data
+            number += 1
+
+
+def send_request(url: str, data: dict = None, timeout: float = 60) -> tuple:
+    """
+    Send the request and read the whole response. Returns the HTTP status (0 if the connection failed)
+    and whether the page shows a conversion error (downloads of failed conversions are empty archives instead).
+    """
+    body = urllib.parse.urlencode(data).encode() if data is not None else None
+    try:
+        with urllib.request.urlopen(url, body, timeout=timeout) as response:
+            content = response.read()
+            return response.status, ERROR_MARKER in content and "html" in response.headers.get("Content-Type", "")
+    except urllib.error.HTTPError as e:
+        return e.code, False
+    except (urllib.error.URLError, OSError):
+        return 0, False
+
+
+def percentiles(latencies: list) -> dict:
+    """Latency summary in seconds: p50, p95, p99, mean and max."""
+    if not latencies:
+        return {}
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {"p50": cut_points[49], "p95": cut_points[94], "p99": cut_points[98],
+            "mean": statistics.fmean(latencies), "max": max(latencies)}
+
+
+def run_load(base_url: str, requests, rate: float, duration: float, concurrency: int) -> list:
+    """
+    Send the requests at the target rate (per second) for the duration (open loop: a slow server doesn't slow
+    the sending down). Latency is measured from the scheduled time, so waiting for a free client thread counts.
+    Returns `(kind, status, latency, conversion error)` of the requests.
+    """
+    results = []
+    lock = threading.Lock()
+
+    def job(kind, path, data, scheduled):
+        status, error = send_request(base_url + path, data)
+        with lock:
+            results.append((kind, status, time.perf_counter() - scheduled, error))
+
+    total = int(rate * duration)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        for number, (kind, path, data) in zip(range(total), requests):
+            scheduled = start + number / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(job, kind, path, data, scheduled)
+    return results
+
+
+def summarize(results: list, elapsed: float) -> dict:
+    """
+    Throughput, statuses and latency percentiles (all requests and per kind). Errors are the failed requests
+    and the pages showing a conversion error.
+    """
+    statuses = {}
+    for _, status, _, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    succeeded = [latency for _, status, latency, error in results if 200 <= status < 400 and not error]
+    kinds = {kind for kind, _, _, _ in results}
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(succeeded),
+        "conversion_errors": sum(1 for _, _, _, error in results if error),
+        "statuses": statuses,
+        "throughput": len(succeeded) / elapsed if elapsed else 0,
+        "latency": percentiles([latency for _, _, latency, _ in results]),
+        "kinds": {kind: dict(requests=sum(1 for k, _, _, _ in results if k == kind),
+                             latency=percentiles([latency for k, _, latency, _ in results if k == kind]))
+                  for kind in sorted(kinds)},
+    }
+
+
+def parse_config(values: list) -> dict:
+    """App settings from `KEY=VALUE` pairs (values are JSON, strings otherwise)."""
+    config = {}
+    for value in values:
+        key, separator, raw = value.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid setting '{value}', expected KEY=VALUE.")
+        try:
+            config[key] = json.loads(raw)
+        except ValueError:
+            config[key] = raw
+    return config
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load",
+                                     description="Load the app in a local server and report latency and memory.")
+    parser.add_argument("--server", choices=("threaded", "processes"), default="threaded",
+                        help="threaded server or a forked process per request (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=8,
+                        help="maximum forked processes of the processes server (default: %(default)s)")
+    parser.add_argument("--config", action="append", default=[], metavar="KEY=VALUE",
+                        help="app setting, e.g. CONVERSION_WORKERS=4 (repeatable)")
+    parser.add_argument("--rate", type=float, default=20, help="requests per second (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="maximum requests in flight (default: %(default)s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="request kinds and weights (default: %(default)s)")
+    parser.add_argument("--repeat-payloads", action="store_true",
+                        help="send the same payloads again (served from the result cache)")
+    parser.add_argument("--full-payloads", action="store_true", help="benchmark-sized payloads instead of small ones")
+    parser.add_argument("-o", "--output", help="save the report as JSON to the file")
+    return parser
+
+
+def main(argv=None) -> int:  # noqa: C901
+    args = build_parser().parse_args(argv)
+    try:
+        weights = parse_mix(args.mix)
+        config = parse_config(args.config)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.server == "processes":
+        # Every request has its own process already
+        config.setdefault("CONVERSION_WORKERS", 0)
+    if args.full_payloads:
+        # The deep nesting payload is deeper than the default limit (it would only measure the error)
+        config.setdefault("PAYLOAD_MAX_DEPTH", None)
+
+    payloads = build_payloads(quick=not args.full_payloads)
+    process, base_url = start_server(config, args.server == "threaded", args.processes)
+    try:
+        # Warm up every kind of request (templates, worker processes), not measured
+        warmup = build_requests({kind: 1 for kind in weights}, payloads)
+        for _, (kind, path, data) in zip(range(len(weights) * len(LANGUAGE_PAGES)), warmup):
+            send_request(base_url + path, data)
+
+        sampler = RSSSampler(process.pid)
+        sampler.start()
+        start = time.perf_counter()
+        results = run_load(base_url, build_requests(weights, payloads, not args.repeat_payloads), args.rate,
+                           args.duration, args.concurrency)
+        elapsed = time.perf_counter() - start
+        peak_rss = sampler.stop()
+    finally:
+        process.kill()
+        process.join()
+
+    report = {
+        "server": args.server,
+        "processes": args.processes if args.server == "processes" else 1,
+        "config": config,
+        "rate": args.rate,
+        "duration": args.duration,
+        "mix": weights,
+        **summarize(results, elapsed),
+        "peak_rss_bytes": peak_rss,
+        # Largest single process of the server (kilobytes on Linux), known once it has exited
+        "max_process_rss_bytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024,
+    }
+
+    latency = report["latency"]
+    print(f"{report['requests']} requests, {report['errors']} errors ({report['conversion_errors']} conversion "
+          f"errors), {report['throughput']:.1f} req/s")
+    if latency:
+        print(f"latency p50 {latency['p50'] * 1000:.1f} ms, p95 {latency['p95'] * 1000:.1f} ms, "
+              f"p99 {latency['p99'] * 1000:.1f} ms, max {latency['max'] * 1000:.1f} ms")
+    for kind, summary in report["kinds"].items():
+        print(f"  {kind:<10} {summary['requests']:>6} requests, p50 {summary['latency']['p50'] * 1000:.1f} ms, "
+              f"p99 {summary['latency']['p99'] * 1000:.1f} ms")
+    if peak_rss is not None:
+        print(f"peak RSS {peak_rss / 1024 / 1024:.1f} MiB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Synthetic payloads of the benchmarks. Generators are deterministic, so the runs are comparable,
+and take the size of the payload (number of keys, levels or elements).
+"""
+
+KEY_STYLES = ("userName{}", "user_name_{}", "UserName{}", "user-name-{}", "HTTPStatus{}", "items{}")
+
+
+def scalar(i: int):
+    """Scalar value of the i-th key (all the scalar types in turn)."""
+    return (i, f"value {i}", i * 1.5, i % 2 == 0)[i % 4]
+
+
+def wide_object(size: int) -> dict:
+    """Single object with many keys of all the naming styles and scalar types."""
+    return {KEY_STYLES[i % len(KEY_STYLES)].format(i): scalar(i) for i in range(size)}
+
+
+def deep_nesting(size: int) -> dict:
+    """Objects nested `size` levels deep (a model per level)."""
+    payload = {"id": 1, "name": "leaf"}
+    for level in reversed(range(size)):
+        payload = {"id": level, f"level{level}": payload}
+    return payload
+
+
+def homogeneous_array(size: int) -> dict:
+    """Long array of objects of the same shape (parsed once as equal elements) and of scalars."""
+    return {
+        "items": [{"id": i, "name": f"item {i}", "price": i * 1.5, "active": i % 2 == 0,
+                   "tags": ["a", "b"], "owner": {"id": i % 10, "email": "owner@example.com"}} for i in range(size)],
+        "ids": list(range(size)),
+    }
+
+
+def heterogeneous_array(size: int) -> dict:
+    """Long array of objects with optional keys, mixed scalar types and nested arrays."""
+    items = []
+    for i in range(size):
+        item = {"id": i, "value": i if i % 2 else f"{i}", f"optional{i % 7}": scalar(i)}
+        if i % 3 == 0:
+            item["children"] = [{"id": j, "note": None if j % 2 else "x"} for j in range(i % 5 + 1)]
+        if i % 5 == 0:
+            item["matrix"] = [[j, j + 1] for j in range(3)]
+        items.append(item)
+    return {"items": items, "values": [scalar(i) for i in range(size)]}
+
+
+def sibling_models(size: int) -> dict:
+    """Object with many sibling sub-models (a model per key)."""
+    return {f"child{i}": {"id": i, "name": f"child {i}", "address": {"city": "Minsk", "zip": f"{i:06d}"}}
+            for i in range(size)}
+
+
+# Payload name => (generator, default size, quick size)
+PAYLOADS = {
+    "wide_object": (wide_object, 2000, 50),
+    "deep_nesting": (deep_nesting, 200, 10),
+    "homogeneous_array": (homogeneous_array, 5000, 50),
+    "heterogeneous_array": (heterogeneous_array, 2000, 50),
+    "sibling_models": (sibling_models, 300, 10),
+}
+
+
+def build_payloads(quick: bool = False) -> dict:
+    """Build all the payloads: name => payload (small ones if `quick`)."""
+    return {name: generator(quick_size if quick else size) for name, (generator, size, quick_size) in PAYLOADS.items()}
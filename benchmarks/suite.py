@@ -0,0 +1,168 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from application.class_generator import ClassGenerator
+from application.config import Config
+from application.converter import EXTENSIONS, LANGUAGES
+from application.functions import _singular_noun, convert_case, to_camel_case, to_pascal_case, to_singular, \
+    to_snake_case
+from application.json_parser import IterativeJSONParser, parse_json_values
+from benchmarks.payloads import build_payloads
+
+# python -m benchmarks.suite -o bench.json
+# python -m benchmarks.suite -k parse_model --compare bench.json
+
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.1
+DEFAULT_THRESHOLD = 1.25
+
+
+def collect_keys(payload) -> list:
+    """Distinct keys of all the objects of the payload (in the order they are found)."""
+    keys = {}
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            keys.update(dict.fromkeys(value))
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return list(keys)
+
+
+def build_benchmarks(payloads: dict, config: Config = None) -> dict:
+    """
+    Benchmarks of the payloads: name => function to time. The inputs (models, generated classes)
+    are prepared here, so every benchmark times one stage only.
+    """
+    config = config if config is not None else Config()
+    benchmarks = {}
+
+    for name, payload in payloads.items():
+        # The parser used by `parse_json_structures`
+        benchmarks[f"parse_model/{name}"] = lambda payload=payload: IterativeJSONParser(config).parse_model(
+            payload, payload)
+        benchmarks[f"detect_type/{name}"] = lambda values=list(payload.values()): [
+            IterativeJSONParser.detect_type(value) for value in values]
+
+    # Case converters are memoized: cold runs start with empty caches, warm runs hit them only
+    keys = collect_keys(list(payloads.values()))
+    for converter in (to_camel_case, to_pascal_case, to_snake_case):
+        benchmarks[f"functions/{converter.__name__}[cold]"] = lambda converter=converter: (
+            convert_case.cache_clear(), [converter(key) for key in keys])
+        benchmarks[f"functions/{converter.__name__}[warm]"] = lambda converter=converter: [
+            converter(key) for key in keys]
+    benchmarks["functions/to_singular[cold]"] = lambda: (
+        _singular_noun.cache_clear(), [to_singular(key) for key in keys])
+    benchmarks["functions/to_singular[warm]"] = lambda: [to_singular(key) for key in keys]
+
+    for name, payload in payloads.items():
+        models, error = parse_json_values(payload, config=config)
+        if error is not None:
+            raise ValueError(f"Payload '{name}' can't be parsed: {error}")
+        for language in LANGUAGES:
+            benchmarks[f"generate_{language}_classes/{name}"] = lambda models=models, language=language: getattr(
+                ClassGenerator(models, config), f"generate_{language}_classes")()
+        classes = ClassGenerator(models, config).generate_php_classes()
+        benchmarks[f"create_zip_response/{name}"] = lambda classes=classes: ClassGenerator.create_zip_response(
+            classes, EXTENSIONS["php"])
+
+    return benchmarks
+
+
+def time_benchmark(function, repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME) -> dict:
+    """
+    Time the function: the number of loops per run is calibrated to take at least `min_time` seconds.
+    Returns seconds per call of the best, median and worst of `repeat` runs.
+    """
+    timer = timeit.Timer(function)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed * 10 < min_time else 2
+
+    runs = [elapsed] + [timer.timeit(loops) for _ in range(repeat - 1)]
+    per_call = [run / loops for run in runs]
+    return {"loops": loops, "runs": len(runs), "min": min(per_call), "median": statistics.median(per_call),
+            "max": max(per_call)}
+
+
+def run_benchmarks(benchmarks: dict, repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME,
+                   keyword: str = None) -> dict:
+    """Run the benchmarks (only the ones having the keyword in the name if it's set): name => timing."""
+    return {name: time_benchmark(function, repeat, min_time)
+            for name, function in benchmarks.items() if not keyword or keyword in name}
+
+
+def compare_results(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """
+    Compare the best runs with the baseline (as saved by `main`): name => ratio (above 1 => slower).
+    Returns the regressions: benchmarks slower than the baseline more than `threshold` times.
+    """
+    ratios = {name: timing["min"] / baseline["benchmarks"][name]["min"]
+              for name, timing in results["benchmarks"].items() if name in baseline["benchmarks"]}
+    results["baseline"] = ratios
+    return {name: ratio for name, ratio in ratios.items() if ratio > threshold}
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Time inference and code generation stages on synthetic payloads.")
+    parser.add_argument("-o", "--output", help="save the results as JSON to the file")
+    parser.add_argument("-k", "--keyword", help="run only the benchmarks having the keyword in the name")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with the results saved before")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio reported as a regression (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per benchmark (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="minimal duration of a run in seconds (default: %(default)s)")
+    parser.add_argument("--quick", action="store_true", help="small payloads (smoke test)")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    benchmarks = build_benchmarks(build_payloads(args.quick))
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "benchmarks": run_benchmarks(benchmarks, args.repeat, args.min_time, args.keyword),
+    }
+
+    regressions = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_results(results, json.load(f), args.threshold)
+
+    for name, timing in results["benchmarks"].items():
+        line = f"{name:<48} {format_seconds(timing['min']):>12} {format_seconds(timing['median']):>12}"
+        if name in results.get("baseline", {}):
+            line += f" {results['baseline'][name]:>6.2f}x" + (" REGRESSION" if name in regressions else "")
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import json
+import pytest
+from application.api import handle_convert_request
+
+document = {"userName": "John", "address": {"city": "Minsk", "zip": "220000"}}
+
+
+def test_convert_document():
+    body, status = handle_convert_request({"json": document, "languages": ["python", "java"]})
+
+    assert status == 200
+    assert body["error"] is None
+    assert list(body["classes"]) == ["python", "java"]
+    assert list(body["classes"]["java"]) == ["RootModel", "Address"]
+
+
+# Test decoded documents give the same classes as JSON texts, and the minimized document makes keys nullable.
+def test_convert_batch():
+    documents = [
+        {"json": document},
+        {"json": '{"userName": "John", "address": {"city": "Minsk", "zip": "220000"}}'},
+        {"json": document, "minimized_json": {"address": {"city": "Minsk"}}},
+        {"json": "{"},
+    ]
+    body, status = handle_convert_request({"documents": documents, "languages": ["php"],
+                                           "options": {"php_jms_annotation": True}})
+
+    assert status == 200
+    results = body["results"]
+    assert [result["error"] for result in results] == [None, None, None, "Error: JSON parsing error"]
+    assert results[0] == results[1]
+    assert "#[Serializer\\SerializedName(\"userName\")]" in results[0]["classes"]["php"]["RootModel"]
+    assert "public string $zip;" in results[0]["classes"]["php"]["Address"]
+    assert "public ?string $zip;" in results[2]["classes"]["php"]["Address"]
+
+
+@pytest.mark.parametrize("payload, expected_error", [
+    (None, "Error: Request body must be a JSON object."),
+    ({}, "Error: Request must have 'json' or 'documents'."),
+    ({"documents": {}}, "Error: 'documents' must be a list of documents (without 'json')."),
+    ({"documents": [document]}, "Error: Every document must be an object with 'json'."),
+    ({"json": document, "languages": ["go"]}, "Error: 'languages' must be a non-empty list of php, java, python."),
+    ({"json": document, "options": {"php_jms": True}}, "Error: Unknown option 'php_jms'."),
+    ({"json": document, "options": {"php_old_version": 1}}, "Error: Option 'php_old_version' must be true or false."),
+    ({"json": 5}, "Error: 'json' must be an object or JSON text."),
+    ({"documents": [{"json": [document]}]}, "Error: 'json' must be an object or JSON text."),
+    ({"json": '{"a": 1}', "minimized_json": {"a": 1}},
+     "Error: 'minimized_json' must be of the same kind as 'json' (object or JSON text)."),
+    ({"json": document, "minimized_json": 5},
+     "Error: 'minimized_json' must be of the same kind as 'json' (object or JSON text)."),
+    ({"json": document, "minimized_json": "{"}, "Error: 'minimized_json' is not valid JSON text."),
+])
+def test_convert_invalid_request(payload, expected_error):
+    assert handle_convert_request(payload) == ({"error": expected_error}, 400)
+
+
+# Test JSON text of the minimized document is decoded for an object document (so it makes keys nullable).
+def test_convert_document_minimized_text():
+    minimized = {"userName": "John", "address": {"city": "Minsk"}}
+    decoded, _ = handle_convert_request({"json": document, "minimized_json": minimized, "languages": ["php"]})
+    body, status = handle_convert_request({"json": document, "minimized_json": json.dumps(minimized),
+                                           "languages": ["php"]})
+
+    assert status == 200
+    assert body == decoded
+    assert "public ?string $zip;" in body["classes"]["php"]["Address"]
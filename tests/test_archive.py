@@ -0,0 +1,54 @@
+import pytest
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+from application.archive import FILE_DATE_TIME, FILE_MTIME, ArchiveOptions, iter_archive
+
+files = [("php/RootModel.php", "<?php\n" + "public int $id;\n" * 200), ("php/Address.php", "<?php\n")]
+
+
+@pytest.mark.parametrize("options, compress_type", [
+    (ArchiveOptions("stored"), zipfile.ZIP_STORED),
+    (ArchiveOptions("deflate", 1), zipfile.ZIP_DEFLATED),
+    (None, zipfile.ZIP_DEFLATED),
+])
+def test_iter_archive_zip(options, compress_type):
+    chunks = list(iter_archive(iter(files), options))
+
+    # A chunk per file and the central directory
+    assert len(chunks) == 3
+    with zipfile.ZipFile(BytesIO(b"".join(chunks))) as zf:
+        assert [info.compress_type for info in zf.infolist()] == [compress_type] * 2
+        assert {info.date_time for info in zf.infolist()} == {FILE_DATE_TIME}
+        assert [(name, zf.read(name).decode()) for name in zf.namelist()] == files
+
+
+def test_iter_archive_tar_gz():
+    archive = b"".join(iter_archive(files, ArchiveOptions("tar.gz", 9)))
+
+    with tarfile.open(fileobj=BytesIO(archive), mode="r:gz") as tar:
+        assert [(info.name, tar.extractfile(info).read().decode()) for info in tar] == files
+        assert {info.mtime for info in tar.getmembers()} == {FILE_MTIME}
+    assert len(archive) < len(files[0][1]) / 10
+
+
+# Test archives of the same files are byte-identical whenever they are made (ETags of downloads stay valid).
+@pytest.mark.parametrize("options", [ArchiveOptions("stored"), ArchiveOptions("deflate"), ArchiveOptions("tar.gz")])
+def test_iter_archive_reproducible(monkeypatch, options):
+    archive = b"".join(iter_archive(files, options))
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 86400 * 400)
+
+    assert b"".join(iter_archive(files, options)) == archive
+
+
+def test_archive_options():
+    assert ArchiveOptions.from_form({}).key == "deflate-6"
+    assert ArchiveOptions.from_form({"archive_format": "stored", "compression_level": "9"}).key == "stored"
+    options = ArchiveOptions.from_form({"archive_format": "tar.gz", "compression_level": "9"})
+    assert (options.key, options.extension, options.mimetype) == ("tar.gz-9", "tar.gz", "application/gzip")
+
+    for form in ({"archive_format": "rar"}, {"compression_level": "10"}, {"compression_level": "max"}):
+        with pytest.raises(ValueError):
+            ArchiveOptions.from_form(form)
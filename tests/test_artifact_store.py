@@ -0,0 +1,40 @@
+import os
+from application.artifact_store import ArtifactStore
+
+
+def test_artifact_store_put_and_open(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    assert store.open("abc123") is None
+    store.put("abc123", b"zip content")
+    with store.open("abc123") as artifact:
+        assert artifact.read() == b"zip content"
+
+
+def test_artifact_store_put_stream(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    assert list(store.put_stream("abc123", iter([b"zip ", b"content"]))) == [b"zip ", b"content"]
+    with store.open("abc123") as artifact:
+        assert artifact.read() == b"zip content"
+
+    # Abandoned stream isn't stored
+    chunks = store.put_stream("def456", iter([b"zip ", b"content"]))
+    next(chunks)
+    chunks.close()
+    assert store.open("def456") is None
+    assert os.listdir(tmp_path / "de") == []
+
+
+def test_artifact_store_eviction(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=20)
+    store.put("aa1", b"x" * 8)
+    store.put("bb2", b"x" * 8)
+    os.utime(store._path("aa1"), (1, 1))
+    os.utime(store._path("bb2"), (2, 2))
+
+    store.put("cc3", b"x" * 8)
+
+    assert store.open("aa1") is None
+    assert store.open("bb2") is not None
+    assert store.open("cc3") is not None
@@ -0,0 +1,89 @@
+import json
+import pytest
+from benchmarks import load
+from benchmarks.payloads import PAYLOADS, build_payloads
+from benchmarks.suite import build_benchmarks, collect_keys, compare_results, main, run_benchmarks
+
+
+def test_collect_keys():
+    assert collect_keys({"a": [{"b": 1, "a": {"c": None}}], "d": [[{"e": 2}]]}) == ["a", "d", "e", "b", "c"]
+
+
+# Test every stage is timed for every payload and the results are comparable.
+def test_run_benchmarks():
+    benchmarks = build_benchmarks(build_payloads(quick=True))
+    for name in PAYLOADS:
+        assert {f"{stage}/{name}" for stage in ("parse_model", "detect_type", "generate_php_classes",
+                                                "generate_java_classes", "generate_python_classes",
+                                                "create_zip_response")} <= benchmarks.keys()
+
+    timings = run_benchmarks(benchmarks, repeat=2, min_time=0, keyword="deep_nesting")
+    assert list(timings) == [name for name in benchmarks if "deep_nesting" in name]
+    assert all(timing["runs"] == 2 and 0 < timing["min"] <= timing["median"] for timing in timings.values())
+
+    results = {"benchmarks": timings}
+    baseline = {"benchmarks": {name: dict(timing, min=timing["min"] / 2) for name, timing in timings.items()}}
+    assert compare_results(results, baseline, threshold=3) == {}
+    assert compare_results(results, baseline, threshold=1.5).keys() == timings.keys()
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+
+    assert main(["--quick", "--repeat", "1", "--min-time", "0", "-k", "sibling_models", "-o", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert results["quick"] is True
+    assert "parse_model/sibling_models" in results["benchmarks"]
+    assert "parse_model/sibling_models" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("mix, expected", [
+    ("page=2,convert=5,download=1", {"page": 2, "convert": 5, "download": 1}),
+    ("convert=1", {"convert": 1}),
+    ("upload=1", ValueError),
+    ("page=x", ValueError),
+    ("page=0", ValueError),
+])
+def test_parse_mix(mix, expected):
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            load.parse_mix(mix)
+    else:
+        assert load.parse_mix(mix) == expected
+
+
+def test_build_requests():
+    requests = load.build_requests({"page": 1, "download": 1}, {"a": {"id": 1}}, unique=True)
+    (kind, path, data), (kind2, path2, data2) = next(requests), next(requests)
+
+    assert (kind, path, data) == ("page", "/php", None)
+    assert (kind2, path2) == ("download", "/java")
+    assert data2 == {"json_full": '{"id": 1, "loadRequest": 1}', "json_min": "", "action": "download"}
+
+
+def test_summarize():
+    results = [("page", 200, 0.01 * i, False) for i in range(1, 101)]
+    results += [("convert", 503, 1.0, False), ("convert", 200, 0.5, True)]
+    summary = load.summarize(results, elapsed=2)
+
+    assert summary["requests"] == 102
+    assert summary["errors"] == 2
+    assert summary["conversion_errors"] == 1
+    assert summary["statuses"] == {"200": 101, "503": 1}
+    assert summary["throughput"] == 50
+    assert summary["kinds"]["page"]["latency"]["p50"] == pytest.approx(0.505)
+    assert summary["kinds"]["convert"]["latency"]["max"] == 1.0
+
+
+# Test the harness end to end with a short load of the threaded server.
+def test_load_main(tmp_path):
+    output = tmp_path / "load.json"
+
+    assert load.main(["--rate", "20", "--duration", "0.5", "--config", "CONVERSION_WORKERS=0", "-o", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["requests"] == 10
+    assert report["statuses"] == {"200": 10}
+    assert report["errors"] == 0
+    assert report["config"] == {"CONVERSION_WORKERS": 0}
+    assert report["latency"]["p50"] <= report["latency"]["p95"] <= report["latency"]["p99"]
+    assert report["peak_rss_bytes"] is None or report["peak_rss_bytes"] > 0
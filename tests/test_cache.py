@@ -0,0 +1,24 @@
+from application.cache import CachedResult, ResultCache
+from application.config import Config
+
+
+def test_result_cache_key():
+    key = ResultCache.make_key('{"a": 1}', '', Config(), 'php')
+
+    assert key == ResultCache.make_key('{"a": 1}', '', Config(), 'php')
+    assert key != ResultCache.make_key('{"a": 1}', '', Config(), 'java')
+    assert key != ResultCache.make_key('{"a": 1}', '', Config(php_jms_annotation=True), 'php')
+    assert key != ResultCache.make_key('{"a": 1}', '{"a": 1}', Config(), 'php')
+
+
+def test_result_cache_eviction():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(CachedResult(key, {}, None))
+
+    assert cache.get("a") is not None
+    cache.put(CachedResult("c", {}, None))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 2, "misses": 1}
@@ -1,6 +1,7 @@
 import pytest
 from app import create_app
 from application.class_generator import ClassGenerator
+from application.config import Config
 
 parsed_model = {
     'RootModel': {
@@ -198,6 +199,78 @@ final class Address
 '''
 }
 
+expected_php_hydrators = {
+    'RootModelHydrator': '''<?php declare(strict_types=1);
+
+namespace App\\Model;
+
+final class RootModelHydrator
+{
+    public static function hydrate(array $data): RootModel
+    {
+        $object = new RootModel();
+        $object->name = $data['name'];
+        $object->age = $data['age'] ?? null;
+        $object->contact = ContactHydrator::hydrate($data['contact']);
+        $object->addresses = array_map([AddressHydrator::class, 'hydrateNullable'], $data['addresses']);
+
+        return $object;
+    }
+
+    public static function hydrateNullable(?array $data): ?RootModel
+    {
+        return $data === null ? null : self::hydrate($data);
+    }
+
+    /** @return array<RootModel> */
+    public static function hydrateAll(array $items): array
+    {
+        return array_map([self::class, 'hydrate'], $items);
+    }
+}
+''',
+
+    'AddressHydrator': '''<?php declare(strict_types=1);
+
+namespace App\\Model;
+
+final class AddressHydrator
+{
+    public static function hydrate(array $data): Address
+    {
+        $object = new Address();
+        $object->street = $data['street'];
+        $object->city = $data['city'] ?? null;
+        $object->code = $data['code'];
+
+        return $object;
+    }
+
+    public static function hydrateNullable(?array $data): ?Address
+    {
+        return $data === null ? null : self::hydrate($data);
+    }
+
+    /** @return array<Address> */
+    public static function hydrateAll(array $items): array
+    {
+        return array_map([self::class, 'hydrate'], $items);
+    }
+}
+''',
+
+    'preload': '''<?php declare(strict_types=1);
+
+// php.ini: opcache.preload=/path/to/preload.php
+opcache_compile_file(__DIR__ . '/RootModel.php');
+opcache_compile_file(__DIR__ . '/Contact.php');
+opcache_compile_file(__DIR__ . '/Address.php');
+opcache_compile_file(__DIR__ . '/RootModelHydrator.php');
+opcache_compile_file(__DIR__ . '/ContactHydrator.php');
+opcache_compile_file(__DIR__ . '/AddressHydrator.php');
+'''
+}
+
 expected_java_classes = {
     'RootModel': '''public class RootModel {
     @JsonProperty("name")
@@ -230,6 +303,125 @@ expected_java_classes = {
 '''
 }
 
+expected_java_streaming_classes = {
+    'RootModel': '''@JsonDeserialize(using = RootModelDeserializer.class)
+public class RootModel {
+    @JsonProperty("name")
+    public String name;
+    @JsonProperty("age")
+    public int age;
+    @JsonProperty("contact")
+    public Contact contact;
+    @JsonProperty("addresses")
+    public ArrayList<Address> addresses;
+}
+''',
+
+    'RootModelDeserializer': '''import com.fasterxml.jackson.core.JsonParser;
+import com.fasterxml.jackson.core.JsonToken;
+import com.fasterxml.jackson.databind.DeserializationContext;
+import com.fasterxml.jackson.databind.JsonDeserializer;
+import java.io.IOException;
+import java.util.ArrayList;
+
+public class RootModelDeserializer extends JsonDeserializer<RootModel> {
+    @Override
+    public RootModel deserialize(JsonParser parser, DeserializationContext context) throws IOException {
+        return read(parser, context);
+    }
+
+    public static RootModel read(JsonParser parser, DeserializationContext context) throws IOException {
+        JsonToken token = parser.currentToken();
+        if (token != JsonToken.START_OBJECT && token != JsonToken.FIELD_NAME) {
+            return (RootModel) context.handleUnexpectedToken(RootModel.class, parser);
+        }
+        RootModel value = new RootModel();
+        String field = token == JsonToken.START_OBJECT ? parser.nextFieldName() : parser.currentName();
+        for (; field != null; field = parser.nextFieldName()) {
+            if (parser.nextToken() == JsonToken.VALUE_NULL) {
+                continue;
+            }
+            switch (field) {
+                case "name": {
+                    value.name = parser.getText();
+                    break;
+                }
+                case "age": {
+                    value.age = parser.getIntValue();
+                    break;
+                }
+                case "contact": {
+                    value.contact = ContactDeserializer.read(parser, context);
+                    break;
+                }
+                case "addresses": {
+                    ArrayList<Address> items0 = new ArrayList<>();
+                    while (parser.nextToken() != JsonToken.END_ARRAY) {
+                        if (parser.currentToken() == JsonToken.VALUE_NULL) {
+                            items0.add(null);
+                            continue;
+                        }
+                        items0.add(AddressDeserializer.read(parser, context));
+                    }
+                    value.addresses = items0;
+                    break;
+                }
+                default:
+                    parser.skipChildren();
+            }
+        }
+        return value;
+    }
+}
+''',
+
+    'AddressDeserializer': '''import com.fasterxml.jackson.core.JsonParser;
+import com.fasterxml.jackson.core.JsonToken;
+import com.fasterxml.jackson.databind.DeserializationContext;
+import com.fasterxml.jackson.databind.JsonDeserializer;
+import java.io.IOException;
+import java.util.ArrayList;
+
+public class AddressDeserializer extends JsonDeserializer<Address> {
+    @Override
+    public Address deserialize(JsonParser parser, DeserializationContext context) throws IOException {
+        return read(parser, context);
+    }
+
+    public static Address read(JsonParser parser, DeserializationContext context) throws IOException {
+        JsonToken token = parser.currentToken();
+        if (token != JsonToken.START_OBJECT && token != JsonToken.FIELD_NAME) {
+            return (Address) context.handleUnexpectedToken(Address.class, parser);
+        }
+        Address value = new Address();
+        String field = token == JsonToken.START_OBJECT ? parser.nextFieldName() : parser.currentName();
+        for (; field != null; field = parser.nextFieldName()) {
+            if (parser.nextToken() == JsonToken.VALUE_NULL) {
+                continue;
+            }
+            switch (field) {
+                case "street": {
+                    value.street = parser.getText();
+                    break;
+                }
+                case "city": {
+                    value.city = parser.getText();
+                    break;
+                }
+                case "code": {
+                    value.code = parser.readValueAs(Object.class);
+                    break;
+                }
+                default:
+                    parser.skipChildren();
+            }
+        }
+        return value;
+    }
+}
+'''
+}
+
 expected_python_classes = {
     'dataclass': '''from typing import List
 from typing import Any
@@ -286,13 +478,106 @@ class RootModel:
 }
 
 
+expected_python_fast_path_classes = {
+    'dataclass': '''from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+
+@dataclass
+class Address:
+    __slots__ = ('street', 'city', 'code')
+    street: str
+    city: Optional[str]
+    code: Any
+
+    @staticmethod
+    def from_dict(obj: Any) -> 'Address':
+        return Address(
+            obj['street'],
+            obj.get('city'),
+            obj['code'],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'street': self.street,
+            'city': self.city,
+            'code': self.code,
+        }
+
+    @staticmethod
+    def from_list(items: List[Any]) -> List['Address']:
+        return list(map(Address.from_dict, items))
+
+
+@dataclass
+class Contact:
+    __slots__ = ('email', 'phone')
+    email: str
+    phone: Optional[str]
+
+    @staticmethod
+    def from_dict(obj: Any) -> 'Contact':
+        return Contact(
+            obj['email'],
+            obj.get('phone'),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'email': self.email,
+            'phone': self.phone,
+        }
+
+    @staticmethod
+    def from_list(items: List[Any]) -> List['Contact']:
+        return list(map(Contact.from_dict, items))
+
+
+@dataclass
+class RootModel:
+    __slots__ = ('name', 'age', 'contact', 'addresses')
+    name: str
+    age: Optional[int]
+    contact: Contact
+    addresses: List[Address]
+
+    @staticmethod
+    def from_dict(obj: Any) -> 'RootModel':
+        return RootModel(
+            obj['name'],
+            obj.get('age'),
+            Contact.from_dict(obj['contact']),
+            [None if item is None else Address.from_dict(item) for item in obj['addresses']],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'age': self.age,
+            'contact': self.contact.to_dict(),
+            'addresses': [None if item is None else item.to_dict() for item in self.addresses],
+        }
+
+    @staticmethod
+    def from_list(items: List[Any]) -> List['RootModel']:
+        return list(map(RootModel.from_dict, items))
+'''
+}
+
+
 # Test classes generation for all languages.
 @pytest.mark.parametrize("language, expected_classes, custom_config_flag", [
     ("php", expected_php_classes, ''),
     ("php", expected_php_classes_with_jms_annotation, 'php_jms_annotation'),
     ("php", expected_php_classes_old_version, 'php_old_version'),
+    ("php", expected_php_hydrators, 'php_hydrators'),
     ("python", expected_python_classes, ''),
+    ("python", expected_python_fast_path_classes, 'python_fast_path'),
     ("java", expected_java_classes, ''),
+    ("java", expected_java_streaming_classes, 'java_streaming_deserializers'),
 ])
 def test_class_generator(language, expected_classes, custom_config_flag):
     app = create_app()
@@ -312,3 +597,93 @@ def test_class_generator(language, expected_classes, custom_config_flag):
         for class_name, expected_code in expected_classes.items():
             assert generated_classes[class_name] == expected_code.strip(), \
                 f"Failed for {class_name} in {language}"
+
+
+# Test the PHP hydrators of nullable models and nested arrays of models.
+def test_php_hydrators_nullable_and_nested():
+    models = dict(parsed_model, RootModel={
+        'contact': ('Contact', True, {'Contact'}),
+        'groups': ('array<array<Address>>', True, {'array<array<Address>>'}),
+        'tags': ('array<string>', False, {'array<string>'}),
+    })
+    hydrator = ClassGenerator(models, Config(php_hydrators=True)).generate_php_classes()['RootModelHydrator']
+
+    assert "        $object->contact = ContactHydrator::hydrateNullable($data['contact'] ?? null);\n" in hydrator
+    assert "        $object->groups = isset($data['groups']) ? array_map(static function ($item0) { " \
+           "return $item0 === null ? null : array_map([AddressHydrator::class, 'hydrateNullable'], $item0); }, " \
+           "$data['groups']) : null;\n" in hydrator
+    assert "        $object->tags = $data['tags'];\n" in hydrator
+
+
+# Test the streaming deserializers use the setters with the properties option.
+def test_java_streaming_deserializers_with_properties():
+    config = Config(java_use_properties=True, java_streaming_deserializers=True)
+    java_classes = ClassGenerator(parsed_model, config).generate_java_classes()
+
+    assert list(java_classes) == [
+        'RootModel', 'Contact', 'Address', 'RootModelDeserializer', 'ContactDeserializer', 'AddressDeserializer',
+    ]
+    assert java_classes['RootModel'].startswith('@JsonDeserialize(using = RootModelDeserializer.class)\npublic class')
+    assert '                    value.setAddresses(items0);\n' in java_classes['RootModelDeserializer']
+    assert '                    value.setPhone(parser.getText());\n' in java_classes['ContactDeserializer']
+    assert java_classes['Contact'] == '''@JsonDeserialize(using = ContactDeserializer.class)
+public class Contact {
+    @JsonProperty("email")
+    public String getEmail() {
+        return this.email;
+    }
+    public void setEmail(String email) {
+        this.email = email;
+    }
+    String email;
+
+    @JsonProperty("phone")
+    public String getPhone() {
+        return this.phone;
+    }
+    public void setPhone(String phone) {
+        this.phone = phone;
+    }
+    String phone;
+
+}'''
+
+
+# Test a model without properties is a valid dataclass (`pass` stands in for the fields).
+def test_python_empty_model():
+    models = {'RootModel': {'meta': ('Meta', False, {'Meta'})}, 'Meta': {}}
+    code = ClassGenerator(models, Config()).generate_python_classes()['dataclass']
+    namespace = {}
+    exec(code, namespace)
+
+    assert '@dataclass\nclass Meta:\n    pass\n\n    @staticmethod\n' in code
+    assert namespace['RootModel'].from_dict({'meta': {}}).meta == namespace['Meta']()
+
+
+# Test the fast path Python classes load, dump and load lists (also nullable and recursive models).
+def test_python_fast_path_classes():
+    models = dict(parsed_model, Node={
+        'id': ('int', False, {'int'}),
+        'parent': ('Node', True, {'Node'}),
+        'children': ('array<Node>', True, {'array<Node>'}),
+    })
+    code = ClassGenerator(models, Config(python_fast_path=True)).generate_python_classes()['dataclass']
+    namespace = {}
+    exec(code, namespace)
+
+    payload = {
+        'name': 'John', 'age': None, 'contact': {'email': 'a@b.c', 'phone': None},
+        'addresses': [{'street': 'Main', 'city': None, 'code': 1}, None],
+    }
+    root = namespace['RootModel'].from_dict(payload)
+    assert root.contact.email == 'a@b.c'
+    assert root.to_dict() == payload
+    assert not hasattr(root, '__dict__')
+    assert [item.to_dict() for item in namespace['RootModel'].from_list([payload, payload])] == [payload, payload]
+
+    node = {'id': 1, 'parent': {'id': 0, 'parent': None, 'children': None}, 'children': [{'id': 2, 'parent': None}]}
+    expected_node = dict(node, children=[{'id': 2, 'parent': None, 'children': None}])
+    assert namespace['Node'].from_dict(node).to_dict() == expected_node
+
+    with pytest.raises(KeyError):
+        namespace['Contact'].from_dict({'phone': None})
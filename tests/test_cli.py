@@ -0,0 +1,76 @@
+import os
+import pytest
+from application.cli import main
+
+
+@pytest.fixture
+def samples(tmp_path):
+    samples_dir = tmp_path / "samples"
+    (samples_dir / "nested").mkdir(parents=True)
+    (samples_dir / "user.json").write_text('{"name": "John", "age": 30}')
+    (samples_dir / "user.min.json").write_text('{"name": "John"}')
+    (samples_dir / "nested" / "order.json").write_text('{"id": 1, "items": [{"sku": "a"}]}')
+    return samples_dir
+
+
+def test_cli_converts_directory(samples, tmp_path, capsys):
+    output = tmp_path / "models"
+
+    assert main([str(samples), "-o", str(output), "-l", "php", "-l", "python", "-j", "2"]) == 0
+    assert "Converted: 2, unchanged: 0, failed: 0" in capsys.readouterr().out
+    assert "public ?int $age;" in (output / "php" / "user" / "RootModel.php").read_text()
+    assert os.path.isfile(output / "php" / "nested" / "order" / "Item.php")
+    assert "class RootModel:" in (output / "python" / "nested" / "order" / "dataclass.py").read_text()
+    assert not os.path.exists(output / "java")
+
+
+def test_cli_skips_unchanged_inputs(samples, tmp_path, capsys):
+    output = tmp_path / "models"
+    args = [str(samples / "*.json"), "-o", str(output), "-l", "java", "-j", "1"]
+
+    assert main(args) == 0
+    assert main(args) == 0
+    assert "Converted: 0, unchanged: 1, failed: 0" in capsys.readouterr().out
+
+    (samples / "user.min.json").write_text('{"name": "John", "age": 30}')
+    assert main(args) == 0
+    assert main(args + ["--java-use-properties"]) == 0
+    assert capsys.readouterr().out.count("Converted: 1, unchanged: 0, failed: 0") == 2
+
+
+def test_cli_reports_errors(samples, tmp_path, capsys):
+    (samples / "broken.json").write_text('{"name": ')
+
+    assert main([str(samples / "broken.json"), str(samples / "missing.json"), "-o", str(tmp_path / "models")]) == 1
+    assert "broken.json: Error: JSON parsing error" in capsys.readouterr().err
+
+
+def test_cli_converts_ndjson_samples(samples, tmp_path, capsys):
+    (samples / "events.ndjson").write_text('{"id": 1, "user": {"name": "a"}}\n{"id": 2, "user": {}}\n')
+    output = tmp_path / "models"
+
+    assert main([str(samples), "-o", str(output), "-l", "php", "--ndjson", "-j", "2"]) == 0
+    assert "Converted: 1, unchanged: 0, failed: 0" in capsys.readouterr().out
+    assert "public int $id;" in (output / "php" / "events" / "RootModel.php").read_text()
+    assert "public ?string $name;" in (output / "php" / "events" / "User.php").read_text()
+
+
+# Test streamed files give the same classes as the loaded ones.
+def test_cli_streams_inputs(samples, tmp_path, capsys):
+    assert main([str(samples), "-o", str(tmp_path / "loaded"), "-l", "php", "-j", "1"]) == 0
+    assert main([str(samples), "-o", str(tmp_path / "streamed"), "-l", "php", "-j", "1", "--stream"]) == 0
+    assert "Converted: 2, unchanged: 0, failed: 0" in capsys.readouterr().out
+
+    for name in ("user/RootModel.php", "nested/order/RootModel.php", "nested/order/Item.php"):
+        assert (tmp_path / "streamed" / "php" / name).read_text() == (tmp_path / "loaded" / "php" / name).read_text()
+    assert "public ?int $age;" in (tmp_path / "streamed" / "php" / "user" / "RootModel.php").read_text()
+
+
+def test_cli_samples_long_arrays(samples, tmp_path, capsys):
+    (samples / "list.json").write_text('{"items": [' + ", ".join(['{"id": 1}'] * 50) + ']}')
+
+    assert main([str(samples / "list.json"), "-o", str(tmp_path / "models"), "-l", "php", "--sample-arrays", "20"]) == 0
+    out = capsys.readouterr().out
+    assert "list.json: sampled $.items: 20 of 50 elements in 1 arrays" in out
+    assert "Converted: 1, unchanged: 0, failed: 0" in out
+    assert "public int $id;" in (tmp_path / "models" / "php" / "list" / "Item.php").read_text()
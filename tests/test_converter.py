@@ -0,0 +1,67 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from application.config import Config
+from application.converter import convert, convert_languages, convert_samples
+
+json_full = '{"userId": 1, "addresses": [{"city": "Minsk"}]}'
+
+
+# Test conversion works without Flask request context.
+@pytest.mark.parametrize("language, options, expected_snippet", [
+    ("php", Config(), "public int $userId;"),
+    ("php", Config(php_jms_annotation=True), '#[Serializer\\SerializedName("userId")]'),
+    ("java", Config(common_with_prefixes=True), "public ArrayList<RootModelAddress> addresses;"),
+    ("python", None, "user_id: int"),
+])
+def test_convert(language, options, expected_snippet):
+    classes, error = convert(json_full, options, language)
+
+    assert error is None
+    assert expected_snippet in "\n".join(classes.values())
+
+
+def test_convert_in_threads():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda language: convert(json_full, Config(), language), ["php", "java"] * 4))
+
+    assert all(error is None and "Address" in classes for classes, error in results)
+
+
+def test_convert_errors():
+    assert convert("{", Config(), "php") == ({}, "Error: JSON parsing error")
+
+    with pytest.raises(ValueError):
+        convert(json_full, Config(), "cobol")
+
+
+# Test all the languages are generated from a single parse, as each of them alone.
+def test_convert_languages():
+    language_classes, error = convert_languages(json_full, Config(php_hydrators=True))
+
+    assert error is None
+    assert list(language_classes) == ["php", "java", "python"]
+    for language, classes in language_classes.items():
+        assert classes == convert(json_full, Config(php_hydrators=True), language)[0]
+
+    assert convert_languages(json_full, None, ["java"])[0].keys() == {"java"}
+    language_classes, error = convert_languages("{", Config())
+    assert error == "Error: JSON parsing error"
+    assert language_classes["php"] == language_classes["java"] == {}
+    with pytest.raises(ValueError):
+        convert_languages(json_full, Config(), ["php", "cobol"])
+
+
+def test_convert_samples():
+    classes, error = convert_samples('{"userId": 1, "email": "a@b.c"}\n{"userId": 2}', Config(), "php")
+
+    assert error is None
+    assert "public int $userId;" in classes["RootModel"]
+    assert "public ?string $email;" in classes["RootModel"]
+
+
+def test_config_from_form():
+    config = Config.from_form({"common_with_prefixes": "enabled", "php_jms_annotation": "disabled"})
+
+    assert config.common_with_prefixes is True
+    assert config.php_jms_annotation is False
+    assert config.php_old_version is False
@@ -0,0 +1,62 @@
+import pytest
+from application.config import Config
+from application.emitter import compile_template, compile_templates, get_template, render, template_names
+
+template = '''%% args class_name, properties
+%% if options.php_jms_annotation:
+use JMS;
+
+%% end
+class {{ class_name }} {
+% for prop in properties:
+%# Optional fields are marked
+%   if prop[1]:
+    {{ prop[0] }}?: "{...}" \\d;
+%   else:
+    {{ prop[0] }}: "{...}" \\d;
+%   end
+% end
+%% if options.php_old_version:
+    // old
+%% else:
+    // {{ len(properties) }} fields, {{ ', '.join([name for name, _ in properties]) }}
+%% end
+}'''
+
+
+@pytest.mark.parametrize("options, expected", [
+    (Config(), 'class A {\n    a: "{...}" \\d;\n    b?: "{...}" \\d;\n    // 2 fields, a, b\n}'),
+    (Config(php_jms_annotation=True, php_old_version=True),
+     'use JMS;\n\nclass A {\n    a: "{...}" \\d;\n    b?: "{...}" \\d;\n    // old\n}'),
+])
+def test_compile_template(options, expected):
+    render_template = compile_template(template, options)
+
+    assert render_template(class_name="A", properties=[("a", False), ("b", True)]) == expected
+
+
+@pytest.mark.parametrize("source, expected_error", [
+    ("% if True:\nx", "Unclosed block in template (template)."),
+    ("%% if True:\nx", "Unclosed block in template (template)."),
+    ("x\n% end", "Unexpected '% end' (template, line 2)."),
+    ("%% for x in y:", "Invalid template directive '%% for x in y:' (template, line 1)."),
+    ("%% end", "Invalid template directive '%% end' (template, line 1)."),
+])
+def test_compile_template_errors(source, expected_error):
+    with pytest.raises(ValueError) as e:
+        compile_template(source, Config())
+
+    assert str(e.value) == expected_error
+
+
+# Test all the templates compile once for the same options.
+def test_compile_templates():
+    names = compile_templates()
+
+    assert names == template_names()
+    assert "php/class" in names and "java/deserializer" in names and "python/dataclass_fast_path" in names
+    key = tuple(vars(Config()).items())
+    assert get_template("php/preload", key) is get_template("php/preload", key)
+    assert render("php/preload", Config(), class_names=["A"]) == \
+        "<?php declare(strict_types=1);\n\n// php.ini: opcache.preload=/path/to/preload.php\n" \
+        "opcache_compile_file(__DIR__ . '/A.php');"
@@ -0,0 +1,86 @@
+import os
+import pytest
+import threading
+import time
+from application.config import Config
+from application.converter import convert
+from application.executor import PoolSaturated, WorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(1, deadline=5)
+    yield pool
+    pool.close()
+
+
+def test_run(pool):
+    json_text = '{"userName": "John"}'
+
+    assert pool.run(convert, json_text, Config(), "python") == convert(json_text, Config(), "python")
+    with pytest.raises(ValueError):
+        pool.run(int, "x")
+
+
+# Test a job past its deadline (or a dead worker) is an error and the worker is replaced for the next jobs.
+def test_run_deadline(pool):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError, match="Conversion took longer than 0.2 seconds."):
+        pool.run(time.sleep, 10, deadline=0.2)
+    assert time.monotonic() - started < 5
+    assert pool.run(pow, 2, 10) == 1024
+
+    with pytest.raises(RuntimeError, match="Conversion worker crashed."):
+        pool.run(os._exit, 1)
+    assert pool.run(pow, 2, 10) == 1024
+
+
+# Test the wait for a free worker counts toward the deadline.
+def test_run_busy(pool):
+    assert pool.run(pow, 2, 10) == 1024
+    worker = pool._idle.get()
+    try:
+        with pytest.raises(TimeoutError, match="No conversion worker became free in 0.1 seconds."):
+            pool.run(pow, 2, 10, deadline=0.1)
+    finally:
+        pool._idle.put(worker)
+
+
+# Test jobs over the waiting limit are rejected right away.
+def test_run_saturated():
+    pool = WorkerPool(1, deadline=5, max_waiting=0)
+    busy = threading.Thread(target=pool.run, args=(time.sleep, 1))
+    busy.start()
+    try:
+        while not pool._jobs:
+            time.sleep(0.01)
+        with pytest.raises(PoolSaturated, match="All 1 conversion workers are busy, try again later."):
+            pool.run(pow, 2, 10)
+    finally:
+        busy.join()
+        pool.close()
+    assert pool._jobs == 0
+
+
+def test_run_inline():
+    assert WorkerPool(0).run(pow, 2, 10) == 1024
+
+
+# Test inline jobs are admitted as if there was a single worker.
+def test_run_inline_saturated():
+    pool = WorkerPool(0, max_waiting=1)
+    started = threading.Barrier(3)
+    release = threading.Event()
+    busy = [threading.Thread(target=pool.run, args=(lambda: (started.wait(), release.wait()),)) for _ in range(2)]
+    for thread in busy:
+        thread.start()
+    try:
+        started.wait()
+        with pytest.raises(PoolSaturated, match="All 1 conversion workers are busy, try again later."):
+            pool.run(pow, 2, 10)
+    finally:
+        release.set()
+        for thread in busy:
+            thread.join()
+    assert pool._jobs == 0
+    assert pool.run(pow, 2, 10) == 1024
@@ -1,6 +1,8 @@
+import inflect
 import pytest
 
-from application.functions import to_camel_case, to_pascal_case, to_snake_case
+from application.functions import SINGULAR_NOUNS, convert_case, convert_keys, to_camel_case, to_pascal_case, \
+    to_singular, to_snake_case
 
 
 @pytest.mark.parametrize("input_str, expected", [
@@ -46,3 +48,35 @@ def test_to_pascal_case(input_str, expected):
 ])
 def test_to_snake_case(input_str, expected):
     assert to_snake_case(input_str) == expected
+
+
+def test_convert_keys():
+    keys = ["user_id", "HTTPRequest", "kebab-case"]
+    assert convert_keys(keys, "camel") == {"user_id": "userId", "HTTPRequest": "httpRequest", "kebab-case": "kebabCase"}
+    assert convert_keys(keys, "pascal") == {
+        "user_id": "UserId", "HTTPRequest": "HttpRequest", "kebab-case": "KebabCase"
+    }
+    assert convert_keys(keys, "snake") == {
+        "user_id": "user_id", "HTTPRequest": "http_request", "kebab-case": "kebab_case"
+    }
+
+    with pytest.raises(ValueError):
+        convert_case("name", "upper")
+
+
+@pytest.mark.parametrize("input_str, expected", [
+    ("Addresses", "Address"),
+    ("Data", "Datum"),
+    ("RootModelItems", "RootModelItem"),
+    ("Wolves", "Wolf"),
+    ("Contact", "Contact"),
+])
+def test_to_singular(input_str, expected):
+    assert to_singular(input_str) == expected
+    assert to_singular(input_str) == expected
+
+
+def test_singular_nouns_table():
+    engine = inflect.engine()
+    for name, singular in SINGULAR_NOUNS.items():
+        assert engine.singular_noun(name) == singular, f"Failed for {name}"
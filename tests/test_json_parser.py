@@ -1,6 +1,10 @@
+import json
+import sys
 import pytest
 from app import create_app
-from application.json_parser import parse_json_structures
+from application.config import Config
+from application.json_parser import ArraySampling, Budget, IterativeJSONParser, JSONParser, parse_json_stream, \
+    parse_json_structures
 
 json_full = '''
 {
@@ -70,11 +74,37 @@ expected_model_mixed_nullable = {
     }
 }
 
+json_repeated_elements = '''
+{
+    "data": [
+        {"type": 1, "tags": [{"id": 1}]},
+        {"type": "asd", "tags": [{"id": 1}]},
+        {"type": 1, "tags": [{"id": 1}]},
+        {"type": 1, "tags": [{"id": 2, "name": "a"}]}
+    ]
+}
+'''
+
+expected_model_repeated_elements = {
+    'RootModel': {
+        'data': ('array<Datum>', False, {'array<Datum>'})
+    },
+    'Datum': {
+        'type': ('mixed', False, {'string', 'int'}),
+        'tags': ('array<Tag>', False, {'array<Tag>'})
+    },
+    'Tag': {
+        'id': ('int', False, {'int'}),
+        'name': ('string', True, {'string'})
+    }
+}
+
 
 # Test parsing logic.
 @pytest.mark.parametrize("json_full_data, json_minimal_data, expected_output", [
     (json_full, json_minimal, expected_model),
-    (json_mixed_nullable, json_mixed_nullable, expected_model_mixed_nullable)
+    (json_mixed_nullable, json_mixed_nullable, expected_model_mixed_nullable),
+    (json_repeated_elements, '', expected_model_repeated_elements)
 ])
 def test_json_model_parser(json_full_data: str, json_minimal_data: str, expected_output: dict):
     app = create_app()
@@ -86,3 +116,108 @@ def test_json_model_parser(json_full_data: str, json_minimal_data: str, expected
 
         # Assert that the parsed structure matches the expected output
         assert parsed_structure == expected_output, f"Failed parsing: {parsed_structure}"
+
+
+# Test streaming parsing gives the same model (small chunks to split tokens between reads).
+@pytest.mark.parametrize("json_full_data, json_minimal_data", [
+    (json_full, json_minimal),
+    (json_full, ''),
+    (json_mixed_nullable, ''),
+    (json_repeated_elements, ''),
+    ('{"items": [{"id": 1}, {"id": "a", "tags": [1, 2.5]}, 3]}', ''),
+    ('{"items": [{"id": null}, "text"]}', ''),
+    ('{"items": [{"id": null}]}', ''),
+    ('[1, 2]', ''),
+    ('{"name": "unterminated}', ''),
+])
+@pytest.mark.parametrize("chunk_size", [1, 5, 1024])
+def test_json_model_stream_parser(json_full_data: str, json_minimal_data: str, chunk_size: int):
+    app = create_app()
+
+    # Define context to prevent Config generation error (request is needed).
+    with app.test_request_context('/'):
+        expected_output = parse_json_structures(json_full_data, json_minimal_data)
+        parsed_structure = parse_json_stream(json_full_data, json_minimal_data, chunk_size=chunk_size)
+
+        assert parsed_structure == expected_output, f"Failed stream parsing: {parsed_structure}"
+
+
+# Test sampling of long arrays: same model for homogeneous data and the coverage report.
+def test_json_model_parser_sampling():
+    app = create_app()
+    json_data = json.dumps({
+        "data": [{"id": i, "tags": ["a"] * 50} for i in range(1000)],
+        "values": [1, "a"] + [1] * 500,
+        "short": [1, 2, 3]
+    })
+
+    with app.test_request_context('/'):
+        sampling = ArraySampling(head=5, tail=5, reservoir=10, seed=1)
+        parsed_structure = parse_json_structures(json_data, '', sampling=sampling)[0]
+
+        assert parsed_structure == parse_json_structures(json_data, '')[0]
+        assert sampling.report == {
+            "$.data": {"arrays": 1, "length": 1000, "inspected": 20},
+            "$.data[*].tags": {"arrays": 1, "length": 50, "inspected": 20},
+            "$.values": {"arrays": 1, "length": 502, "inspected": 20},
+        }
+
+
+# Test the iterative parser gives the same models (also in the same order) as the recursive one.
+@pytest.mark.parametrize("json_full_data, json_minimal_data", [
+    (json_full, json_minimal),
+    (json_full, json_full),
+    (json_mixed_nullable, json_mixed_nullable),
+    (json_repeated_elements, json_repeated_elements),
+    ('{"items": [[{"id": 1}], [[1, 2]], [null, [2.5]]], "matrix": [[1, 2], [3]]}', '{}'),
+    ('{"items": [{"id": 1, "tags": [{"a": 1}]}, {"id": 2, "tags": [{"a": null, "b": "x"}]}, {"id": 3}]}', '{}'),
+])
+@pytest.mark.parametrize("common_with_prefixes", [False, True])
+def test_iterative_json_parser(json_full_data: str, json_minimal_data: str, common_with_prefixes: bool):
+    config = Config(common_with_prefixes=common_with_prefixes)
+    full_json, minimized_json = json.loads(json_full_data), json.loads(json_minimal_data)
+
+    expected_output = JSONParser(config).parse_model(full_json, minimized_json)
+    parsed_structure = IterativeJSONParser(config).parse_model(full_json, minimized_json)
+
+    assert parsed_structure == expected_output
+    assert [list(model) for model in parsed_structure.values()] == [list(model) for model in expected_output.values()]
+
+
+# Test documents nested deeper than the recursion limit are parsed as well.
+def test_json_model_parser_deep_nesting():
+    depth = sys.getrecursionlimit() * 3
+    json_data = "".join(f'{{"level{i}": [' for i in range(depth)) + '{"value": 1}' + "]}" * depth
+
+    parsed_structure, error = parse_json_structures(json_data, '')
+
+    assert error is None
+    assert len(parsed_structure) == depth + 1
+    assert parsed_structure["RootModel"] == {"level0": ("array<Level0>", False, {"array<Level0>"})}
+    assert parsed_structure[f"Level{depth - 1}"] == {"value": ("int", False, {"int"})}
+
+
+@pytest.mark.parametrize("budget, json_data, expected_error", [
+    (Budget(max_bytes=15), '{"a": "xxxxxxxxxx"}', "Error: JSON is larger than 15 bytes."),
+    (Budget(max_bytes=15), '{"a": "éééé"}', "Error: JSON is larger than 15 bytes."),
+    (Budget(max_bytes=15), '{"a": "xxxx"}', None),
+    (Budget(max_depth=2), '{"a": {"b": {"c": 1}}}', "Error: JSON is nested deeper than 2 levels."),
+    (Budget(max_depth=2), '{"a": [[1]]}', "Error: JSON is nested deeper than 2 levels."),
+    (Budget(max_depth=2), '{"a": [{"b": 1}]}', "Error: JSON is nested deeper than 2 levels."),
+    (Budget(max_depth=3), '{"a": [{"b": 1}], "c": {"d": [1]}}', None),
+    (Budget(max_keys=3), '{"a": 1, "b": {"c": 1, "d": 2}}', "Error: JSON has more than 3 keys."),
+    (Budget(max_keys=3), '{"a": [{"b": 1}, {"b": 2}, {"b": 3}, {"b": 4}]}', None),
+    (Budget(max_array_length=2), '{"a": [1, 2, 3]}', "Error: JSON has an array longer than 2 elements."),
+    (Budget(max_array_length=2), '{"a": [[1], [1, 2, 3]]}', "Error: JSON has an array longer than 2 elements."),
+    (Budget(max_models=2), '{"a": {"b": {"c": 1}}}', "Error: JSON needs more than 2 models."),
+    (Budget(max_models=3), '{"a": {"b": {"c": 1}}}', None),
+    (Budget(), '5', "Error: JSON parsing error"),
+    (Budget(), 'null', "Error: JSON parsing error"),
+    (Budget(), '[{"a": 1}]', "Error: JSON parsing error"),
+])
+def test_json_model_parser_budget(budget: Budget, json_data: str, expected_error: str):
+    parsed_structure, error = parse_json_structures(json_data, '', budget=budget)
+
+    assert error == expected_error
+    if expected_error is None:
+        assert parsed_structure == parse_json_structures(json_data, '')[0]
@@ -0,0 +1,46 @@
+import io
+import json
+import sys
+
+import pytest
+
+from application.json_stream import iter_events, loads
+
+
+json_document = '{"a": [1, -2.5e-3, true, null, "x\\"y\\\\", {}], "b": {"c": "\\u00e9"}, "d": []}'
+
+expected_events = [
+    ("start_map", None),
+    ("map_key", "a"), ("start_array", None),
+    ("value", 1), ("value", -2.5e-3), ("value", True), ("value", None), ("value", 'x"y\\'),
+    ("start_map", None), ("end_map", None),
+    ("end_array", None),
+    ("map_key", "b"), ("start_map", None), ("map_key", "c"), ("value", "é"), ("end_map", None),
+    ("map_key", "d"), ("start_array", None), ("end_array", None),
+    ("end_map", None),
+]
+
+
+# Test events are the same whatever the chunks split is.
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_iter_events(chunk_size):
+    assert list(iter_events(json_document, chunk_size)) == expected_events
+    assert list(iter_events(io.BytesIO(json_document.encode()), chunk_size)) == expected_events
+
+
+@pytest.mark.parametrize("document", ['', '{', '[1,]', '{"a" 1}', '{"a": 1,}', '[1] 2', 'tru', '"abc', '[1 2]'])
+def test_iter_events_invalid_json(document):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_events(document, 2))
+
+
+# Test loading gives the same value as `json.loads` and works beyond its nesting limit.
+def test_loads():
+    assert loads(json_document) == json.loads(json_document)
+    assert loads(io.StringIO(json_document), 3) == json.loads(json_document)
+
+    depth = sys.getrecursionlimit() * 3
+    value = loads("[" * depth + "1" + "]" * depth)
+    for _ in range(depth):
+        value = value[0]
+    assert value == 1
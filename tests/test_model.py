@@ -0,0 +1,33 @@
+import sys
+from application.model import Property
+
+
+def test_property_single_type():
+    prop = Property("array<" + "Address>", False)
+
+    assert prop.type is sys.intern("array<Address>")
+    assert not prop.has_multiple_types
+    assert prop == ("array<Address>", False, {"array<Address>"})
+
+
+def test_property_add_type():
+    prop = Property("int", False)
+    prop.add_type("int")
+    assert not prop.has_multiple_types
+
+    prop.add_type("string")
+    prop.type = "mixed"
+    prop_type, nullable, types = prop
+
+    assert prop.has_multiple_types
+    assert (prop_type, nullable, types) == ("mixed", False, {"int", "string"})
+    assert Property("mixed", False, {"string", "int"}) == prop
+
+
+def test_property_copy():
+    prop = Property("int", True)
+    copy = prop.copy()
+    prop.add_type("float")
+
+    assert copy == ("int", True, {"int"})
+    assert prop != copy
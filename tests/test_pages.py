@@ -1,5 +1,10 @@
+import os
 import pytest
+import tarfile
+import zipfile
+from io import BytesIO
 from app import create_app
+from application.executor import PoolSaturated, WorkerPool
 
 
 @pytest.fixture
@@ -31,3 +36,170 @@ def test_python_page(client):
     response = client.get('/python')
     assert response.status_code == 200
     assert b'RootModel.from_dict' in response.data
+
+
+def test_php_page_conversion(client):
+    response = client.post('/php', data={
+        "json_full": '{"userName": "John"}', "json_min": "", "php_jms_annotation": ["enabled", "disabled"]
+    })
+    assert response.status_code == 200
+    assert b'SerializedName(&#34;userName&#34;)' in response.data
+
+
+def test_php_page_download(client):
+    response = client.post('/php', data={"json_full": '{"userName": "John"}', "json_min": "", "action": "download"})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+
+
+def test_php_page_download_hydrators(client):
+    response = client.post('/php', data={
+        "json_full": '{"userName": "John"}', "json_min": "", "php_hydrators": ["enabled", "disabled"],
+        "action": "download",
+    })
+    assert response.status_code == 200
+    names = zipfile.ZipFile(BytesIO(response.data)).namelist()
+    assert names == ['RootModel.php', 'RootModelHydrator.php', 'preload.php']
+
+
+def test_all_languages(client):
+    data = {"json_full": '{"userName": "John"}', "json_min": ""}
+    response = client.post('/all', data=data)
+    assert response.status_code == 200
+    assert response.get_json()["error"] is None
+    assert response.get_json()["classes"].keys() == {'php', 'java', 'python'}
+
+    response = client.post('/all', data=dict(data, action="download"))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    assert zipfile.ZipFile(BytesIO(response.data)).namelist() == [
+        'php/RootModel.php', 'java/RootModel.java', 'python/dataclass.py',
+    ]
+
+
+def test_api_convert(client):
+    response = client.post('/api/v1/convert', json={"json": {"userName": "John"}, "languages": ["java", "php"]})
+    assert response.status_code == 200
+    assert list(response.get_json()["classes"]) == ["java", "php"]
+
+    response = client.post('/api/v1/convert', data="{", content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Error: Request body must be a JSON object."}
+
+
+# Test oversized requests are rejected and the other budget limits stop the inference with an error.
+def test_payload_budget():
+    client = create_app({"PAYLOAD_MAX_BYTES": 1000, "PAYLOAD_MAX_DEPTH": 2}).test_client()
+
+    response = client.post('/php', data={"json_full": '{"a": "' + "x" * 100_000 + '"}', "json_min": ""})
+    assert response.status_code == 413
+
+    response = client.post('/all', data={"json_full": '{"a": "' + "x" * 2000 + '"}', "json_min": ""})
+    assert response.get_json()["error"] == "Error: JSON is larger than 1000 bytes."
+
+    response = client.post('/all', data={"json_full": '{"a": {"b": {"c": 1}}}', "json_min": ""})
+    assert response.get_json()["error"] == "Error: JSON is nested deeper than 2 levels."
+
+    response = client.post('/api/v1/convert', json={"json": {"a": {"b": {"c": 1}}}, "languages": ["php"]})
+    assert response.get_json()["error"] == "Error: JSON is nested deeper than 2 levels."
+
+
+# Test a root value that isn't an object is a JSON parsing error (not a server error).
+@pytest.mark.parametrize("json_full", ["5", "1.5", "true", "null"])
+def test_scalar_root(client, json_full):
+    response = client.post('/php', data={"json_full": json_full, "json_min": ""})
+    assert response.status_code == 200
+    assert b"Error: JSON parsing error" in response.data
+
+    response = client.post('/api/v1/convert', json={"json": "[1]"})
+    assert response.get_json()["error"] == "Error: JSON parsing error"
+
+
+def test_saturated(client, monkeypatch):
+    def run(*args, **kwargs):
+        raise PoolSaturated("All 1 conversion workers are busy, try again later.")
+    monkeypatch.setattr(WorkerPool, "run", run)
+
+    response = client.post('/php', data={"json_full": '{"a": 1}', "json_min": ""})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    response = client.post('/api/v1/convert', json={"json": {"a": 1}})
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Error: All 1 conversion workers are busy, try again later."}
+
+
+@pytest.mark.parametrize("form, mimetype, extension", [
+    ({"archive_format": "stored"}, 'application/zip', 'zip'),
+    ({"archive_format": "deflate", "compression_level": "9"}, 'application/zip', 'zip'),
+    ({"archive_format": "tar.gz"}, 'application/gzip', 'tar.gz'),
+])
+def test_download_archive_formats(client, form, mimetype, extension):
+    data = dict(form, json_full='{"userName": "John", "address": {"city": "Minsk"}}', json_min="", action="download")
+    response = client.post('/java', data=data)
+
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    assert response.headers["Content-Disposition"].endswith(f".{extension}")
+    if extension == 'zip':
+        names = zipfile.ZipFile(BytesIO(response.data)).namelist()
+    else:
+        names = tarfile.open(fileobj=BytesIO(response.data), mode="r:gz").getnames()
+    assert names == ['RootModel.java', 'Address.java']
+
+
+def test_download_invalid_archive_format(client):
+    data = {"json_full": '{"userName": "John"}', "json_min": "", "action": "download", "archive_format": "rar"}
+    response = client.post('/java', data=data)
+
+    assert response.status_code == 400
+    assert response.get_data(as_text=True) == "Error: Unknown archive format 'rar'."
+
+
+def test_conversion_cache(client):
+    data = {"json_full": '{"userName": "John"}', "json_min": ""}
+    client.post('/java', data=data)
+    client.post('/java', data=data)
+    client.post('/python', data=data)
+
+    assert client.get('/stats/cache').get_json() == {"entries": 2, "max_entries": 256, "hits": 1, "misses": 2}
+
+
+def test_download_etag(client):
+    data = {"json_full": '{"userName": "John"}', "json_min": "", "action": "download"}
+    response = client.post('/php', data=data)
+    etag = response.headers["ETag"]
+
+    assert response.status_code == 200
+    assert client.post('/php', data=data, headers={"If-None-Match": etag}).status_code == 304
+    assert client.post('/java', data=data, headers={"If-None-Match": etag}).status_code == 200
+
+
+# Test a download of a conversion that didn't complete is an error, not an empty archive stored under its key.
+def test_download_timeout(tmp_path):
+    data = {"json_full": '{"userName": "John"}', "json_min": "", "action": "download"}
+    app = create_app({"TESTING": True, "ARTIFACT_STORE_DIR": str(tmp_path), "CONVERSION_WORKERS": 1,
+                      "CONVERSION_DEADLINE": 1e-6})
+
+    response = app.test_client().post('/java', data=data)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert "ETag" not in response.headers
+    assert os.listdir(tmp_path) == []
+
+    response = create_app({"TESTING": True, "ARTIFACT_STORE_DIR": str(tmp_path)}).test_client().post('/java', data=data)
+    with zipfile.ZipFile(BytesIO(response.get_data())) as zf:
+        assert zf.namelist() == ["RootModel.java"]
+
+
+def test_download_from_artifact_store(tmp_path):
+    app = create_app({"TESTING": True, "ARTIFACT_STORE_DIR": str(tmp_path)})
+    data = {"json_full": '{"userName": "John"}', "json_min": "", "action": "download"}
+
+    with app.test_client() as client:
+        first = client.post('/java', data=data)
+        second = client.post('/java', data=data)
+
+    assert first.status_code == second.status_code == 200
+    assert first.get_data() == second.get_data()
+    assert os.listdir(tmp_path / first.headers["ETag"].strip('"')[:2]) == [first.headers["ETag"].strip('"')]
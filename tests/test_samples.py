@@ -0,0 +1,95 @@
+import pytest
+from application.config import Config
+from application.samples import PartialModel, parse_ndjson, parse_samples
+
+ndjson_samples = '''
+{"id": 1, "name": "John", "orders": [{"id": 1, "coupon": "A"}, {"id": 2}], "address": {"city": "Minsk"}}
+{"id": 2, "name": null, "orders": [], "address": {"city": "Riga", "zip": "LV-1010"}}
+
+{"id": 3, "orders": [{"id": 3, "coupon": "B"}, {"id": 4, "coupon": "B"}], "address": {"city": "Oslo"}}
+'''
+
+expected_models = {
+    "RootModel": {
+        "id": ("int", False, {"int"}),
+        "name": ("string", True, {"string"}),
+        "orders": ("array<Order>", False, {"array<Order>", "array<mixed>"}),
+        "address": ("Address", False, {"Address"}),
+    },
+    "Order": {
+        "id": ("int", False, {"int"}),
+        "coupon": ("string", True, {"string"}),
+    },
+    "Address": {
+        "city": ("string", False, {"string"}),
+        "zip": ("string", True, {"string"}),
+    },
+}
+
+
+# Test nullability comes from the key presence and the result doesn't depend on chunks and processes.
+@pytest.mark.parametrize("jobs, samples_per_chunk", [(1, 1000), (1, 1), (1, 2), (2, 1)])
+def test_parse_ndjson(jobs, samples_per_chunk):
+    models, error = parse_ndjson(ndjson_samples, jobs=jobs, samples_per_chunk=samples_per_chunk)
+
+    assert error is None
+    assert models == expected_models
+    assert list(models) == ["RootModel", "Order", "Address"]
+
+
+# Test the merge of partial models is associative.
+def test_partial_model_merge():
+    samples = [(line_number, line) for line_number, line in enumerate(ndjson_samples.splitlines()) if line]
+    parts = [lambda i=i: parse_samples(samples[i:i + 1]) for i in range(len(samples))]
+
+    left = parts[0]().merge(parts[1]()).merge(parts[2]())
+    right = parts[0]().merge(parts[1]().merge(parts[2]()))
+
+    assert left.to_models() == right.to_models() == expected_models
+    assert left.objects == right.objects == {"RootModel": 3, "Order": 4, "Address": 3}
+    assert left.presence["Order"] == {"id": 4, "coupon": 3}
+    assert PartialModel().merge(left).to_models() == expected_models
+
+
+@pytest.mark.parametrize("samples, expected_error", [
+    ('{"id": 1}\n\n{"id": {"a": 1}}', "Error: Type conflict for key 'id': cannot combine 'int' with 'Id'. (line 3)"),
+    ('{"id": 1}\n{"id": ', "Error: JSON parsing error on line 2"),
+    ('{"id": 1}\n[1, 2]', "Error: JSON parsing error on line 2"),
+    ('{"id": null}\n{"id": null}', "Error: Unknown type for value 'None'."),
+])
+def test_parse_ndjson_errors(samples, expected_error):
+    assert parse_ndjson(samples, Config()) == ({}, expected_error)
+
+
+# Test a null value is nullable even if the type only comes from a later sample (in another chunk).
+def test_parse_ndjson_null_before_type():
+    models, error = parse_ndjson('{"id": null}\n{"id": 1}', samples_per_chunk=1)
+
+    assert error is None
+    assert models == {"RootModel": {"id": ("int", True, {"int"})}}
+
+
+# Test chunks are read lazily and merged as they are parsed, not all read up front.
+@pytest.mark.parametrize("jobs, max_read", [(1, 1), (2, 5)])
+def test_parse_ndjson_reads_chunks_lazily(monkeypatch, jobs, max_read):
+    read = []
+
+    def lines():
+        for number in range(20):
+            read.append(number)
+            yield f'{{"id": {number}}}'
+
+    merge = PartialModel.merge
+    read_at_merge = []
+
+    def recording_merge(self, other):
+        read_at_merge.append(len(read))
+        return merge(self, other)
+
+    monkeypatch.setattr(PartialModel, "merge", recording_merge)
+    models, error = parse_ndjson(lines(), jobs=jobs, samples_per_chunk=1)
+
+    assert error is None
+    assert models == {"RootModel": {"id": ("int", False, {"int"})}}
+    assert len(read_at_merge) == 20
+    assert read_at_merge[0] <= max_read
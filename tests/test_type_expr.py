@@ -0,0 +1,36 @@
+import pytest
+from application.type_expr import ARRAY, MODEL, SCALAR, TypeExpr, parse_type, to_java_type, to_php_type, \
+    to_python_type, union_type
+
+
+def test_parse_type():
+    assert parse_type("int") == TypeExpr(SCALAR, "int")
+    assert parse_type("Subarray") == TypeExpr(MODEL, "Subarray")
+    assert parse_type("array<array<Address>>") == TypeExpr(ARRAY, TypeExpr(ARRAY, TypeExpr(MODEL, "Address")))
+    assert parse_type("array<array<Address>>") is parse_type("array<array<Address>>")
+    assert str(parse_type("array<array<Address>>")) == "array<array<Address>>"
+
+
+@pytest.mark.parametrize("prop_type, php_type, java_type, python_type", [
+    ("string", "string", "String", "str"),
+    ("float", "float", "double", "float"),
+    ("mixed", "mixed", "mixed", "Any"),
+    ("Address", "Address", "Address", "Address"),
+    ("array<bool>", "array", "ArrayList<boolean>", "list"),
+    ("array<Address>", "array", "ArrayList<Address>", "List[Address]"),
+    ("array<mixed>", "array", "ArrayList<mixed>", "List[Any]"),
+    ("array<array<float>>", "array", "ArrayList<ArrayList<double>>", "List[list]"),
+])
+def test_language_types(prop_type, php_type, java_type, python_type):
+    assert to_php_type(parse_type(prop_type)) == php_type
+    assert to_java_type(parse_type(prop_type)) == java_type
+    assert to_python_type(parse_type(prop_type)) == python_type
+
+
+def test_union_type():
+    expr = union_type(frozenset({"string", "int", "float"}))
+
+    assert expr.is_union
+    assert to_php_type(expr) == "float|int|string"
+    assert to_java_type(expr) == "String|double|int"
+    assert to_python_type(expr) == "Any"
@@ -0,0 +1,104 @@
+import json
+import pytest
+from application.json_parser import parse_json_structures
+from application.samples import iter_samples
+from application.validator import Deviation, compile_validator
+
+json_full = {
+    "id": 1,
+    "name": "John",
+    "score": 2.5,
+    "value": 1,
+    "tags": ["a", None],
+    "address": {"city": "Minsk", "zip": "220000"},
+    "orders": [{"id": 1, "items": [{"sku": "a", "qty": 1}]}],
+    "children": [{"children": [{"children": []}]}],
+}
+json_minimal = {
+    "id": 1,
+    "score": 2.5,
+    "value": "a",
+    "tags": [],
+    "address": {"city": "Minsk"},
+    "orders": [{"id": 1, "items": [{"sku": "a", "qty": 1}]}],
+    "children": [{}],
+}
+
+models = parse_json_structures(json.dumps(json_full), json.dumps(json_minimal))[0]
+models["RootModel"]["value"].add_type("string")
+models["RootModel"]["value"].type = "mixed"
+
+
+def changed(**changes) -> dict:
+    payload = json.loads(json.dumps(json_full))
+    for path, value in changes.items():
+        target = payload
+        *parents, key = path.split("__")
+        for parent in parents:
+            target = target[int(parent) if parent.isdigit() else parent]
+        if value is KeyError:
+            del target[key]
+        else:
+            target[int(key) if key.isdigit() else key] = value
+    return payload
+
+
+@pytest.mark.parametrize("payload, expected_deviation", [
+    (json_full, None),
+    (changed(name=None, value="x", score=3, address__zip=None), None),
+    (changed(name=KeyError, tags=[], orders=[]), None),
+    (changed(children__0__children=[{"children": [{"children": None}]}]), None),
+    (changed(id=KeyError), Deviation("$.id", "missing key")),
+    (changed(id="1"), Deviation("$.id", "expected int but got string")),
+    (changed(id=True), Deviation("$.id", "expected int but got bool")),
+    (changed(value=[1]), Deviation("$.value", "expected int or string but got array")),
+    (changed(extra=1), Deviation("$.extra", "unknown key")),
+    (changed(tags__1=2), Deviation("$.tags[1]", "expected string but got int")),
+    (changed(address=[]), Deviation("$.address", "expected Address but got array")),
+    (changed(address__city=None), Deviation("$.address.city", "expected string but got null")),
+    (changed(orders__0__items__0__qty=1.5), Deviation("$.orders[0].items[0].qty", "expected int but got float")),
+    (changed(children__0__x=1), Deviation("$.children[0].x", "unknown key")),
+    ([json_full], Deviation("$", "expected RootModel but got array")),
+])
+def test_validate(payload, expected_deviation):
+    validator = compile_validator(models)
+
+    assert validator.validate(payload) == expected_deviation
+
+
+def test_validate_unknown_keys_allowed():
+    validator = compile_validator(models, allow_unknown_keys=True)
+
+    assert validator.validate(changed(extra=1, address__extra=[])) is None
+
+
+def test_validate_many():
+    validator = compile_validator(models)
+    payloads = [json_full, changed(id=None), json_full]
+
+    assert list(validator.validate_many(iter(payloads))) == [None, Deviation("$.id", "expected int but got null"), None]
+
+    samples = iter_samples("\n".join([json.dumps(json_full), "{", json.dumps(changed(score="a"))]))
+    assert list(validator.iter_deviations(samples)) == [
+        (2, Deviation("$", "JSON parsing error")),
+        (3, Deviation("$.score", "expected float but got string")),
+    ]
+
+
+# Test every sample matches the models inferred from it (all types seen for a key are accepted).
+@pytest.mark.parametrize("sample, deviating, expected_deviation", [
+    (json_full, changed(id="1"), Deviation("$.id", "expected int but got string")),
+    ({"a": [{"x": [1]}, {"x": ["s"]}]}, {"a": [{"x": [1.5]}]},
+     Deviation("$.a[0].x", "expected array<int> or array<string> but got array")),
+    ({"a": [{"x": {"k": 1}}, {"x": [1]}]}, {"a": [{"x": "s"}]},
+     Deviation("$.a[0].x", "expected X or array<int> but got string")),
+    ({"a": [{"b": [{"c": 1}]}, {"b": [[1]]}]}, {"a": [{"b": [{"c": "s"}]}]},
+     Deviation("$.a[0].b", "expected array<B> or array<array<int>> but got array")),
+])
+def test_validate_own_sample(sample, deviating, expected_deviation):
+    sample_models, error = parse_json_structures(json.dumps(sample), json.dumps(sample))
+    validator = compile_validator(sample_models)
+
+    assert error is None
+    assert validator.validate(sample) is None
+    assert validator.validate(deviating) == expected_deviation